@@ -0,0 +1,60 @@
+# bench_fleet.py
+"""
+Benchmark: fleet throughput vs number of worker processes sharing one SQLite
+WorkQueue. The gate is simulated by a fixed sleep (real gates are dominated by
+GitHub/LLM latency), so the numbers isolate queue coordination overhead.
+No network needed.
+
+    python bench_fleet.py [--jobs 200] [--gate-ms 50] [--workers 1,2,4,8]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from gatekeeper.fleet import run_worker
+from utils.work_queue import WorkQueue
+
+
+def worker(path: str, gate_ms: float, worker_id: str) -> None:
+    queue = WorkQueue(path)
+    run_worker(queue, lambda job: time.sleep(gate_ms / 1000) or {"decision": "GO"},
+               worker_id=worker_id, report_every=float("inf"), log=lambda line: None)
+
+
+def run(jobs: int, gate_ms: float, k: int) -> float:
+    """Seconds to drain `jobs` jobs with k worker processes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fleet.sqlite")
+        WorkQueue(path).enqueue((f"o/r{i}", "main", "") for i in range(jobs))
+        procs = [mp.Process(target=worker, args=(path, gate_ms, f"w{i}")) for i in range(k)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - t0
+        assert WorkQueue(path).progress()["done"] == jobs
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fleet work-queue scaling benchmark")
+    ap.add_argument("--jobs", type=int, default=200, help="Jobs to drain per run")
+    ap.add_argument("--gate-ms", type=float, default=50.0, help="Simulated gate latency per job")
+    ap.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = ap.parse_args()
+
+    base = None
+    print(f"{args.jobs} jobs, {args.gate_ms:g} ms simulated gate")
+    print(f"{'workers':>8} {'wall s':>8} {'jobs/s':>8} {'speedup':>8} {'efficiency':>10}")
+    for k in (int(x) for x in args.workers.split(",")):
+        elapsed = run(args.jobs, args.gate_ms, k)
+        rate = args.jobs / elapsed
+        base = base or rate
+        print(f"{k:>8} {elapsed:>8.2f} {rate:>8.1f} {rate / base:>7.2f}x {rate / base / k:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# bench_parse.py
+"""
+Benchmark: full r.json() vs streaming field projection (tools.github_tools._project)
+on large synthetic GitHub listings. No network needed.
+
+Two timings per payload:
+  - in memory: pure CPU parse time (the body is already local)
+  - at --mbps: the body "arrives" at that rate, like a socket, so streaming can
+    parse while later bytes are still in flight; r.json() has to wait for all of them
+
+    python bench_parse.py [--items 300] [--repeat 5] [--mbps 20]
+"""
+import argparse
+import io
+import json
+import time
+import tracemalloc
+
+import requests
+
+from tools import github_tools as gt
+
+
+def fake_user(i):
+    return {"login": f"user{i}", "id": i, "node_id": "U_" + "x" * 20, "avatar_url": "https://avatars/" + "a" * 60,
+            "url": f"https://api.github.com/users/user{i}", "html_url": f"https://github.com/user{i}",
+            "type": "User", "site_admin": False, **{f"{k}_url": "https://api.github.com/x" * 2 for k in
+            ("followers", "following", "gists", "starred", "subscriptions", "organizations", "repos", "events")}}
+
+
+def fake_pull(i):
+    return {"number": i, "title": f"PR {i}", "state": "open", "body": "Lorem ipsum dolor sit amet. " * 150,
+            "user": fake_user(i), "html_url": f"https://github.com/o/r/pull/{i}",
+            "labels": [{"id": 1, "name": "dependencies", "color": "0366d6", "description": "d" * 40}],
+            "head": {"sha": f"{i:040x}", "ref": f"feat-{i}", "user": fake_user(i), "repo": {"full_name": "o/r", "description": "d" * 300}},
+            "base": {"sha": "0" * 40, "ref": "main", "user": fake_user(0), "repo": {"full_name": "o/r", "description": "d" * 300}},
+            "requested_reviewers": [fake_user(j) for j in range(3)]}
+
+
+def fake_issue(i):
+    return {"number": i, "title": f"Issue {i}", "state": "open", "body": "Steps to reproduce... " * 200,
+            "user": fake_user(i), "html_url": f"https://github.com/o/r/issues/{i}", "comments": 3,
+            "labels": [{"id": 2, "name": "release-blocker" if i % 7 == 0 else "bug", "color": "d73a4a"}],
+            "assignees": [fake_user(j) for j in range(2)]}
+
+
+def fake_check_run(i):
+    return {"id": i, "name": f"check-{i}", "status": "completed", "conclusion": "success",
+            "html_url": f"https://github.com/o/r/actions/runs/1/job/{i}", "app": {"owner": fake_user(0), "description": "a" * 400},
+            "output": {"title": "ok", "summary": "s" * 500, "text": "annotated output\n" * 200}}
+
+
+class Trickle(io.RawIOBase):
+    """Readable body whose byte n only becomes available n / rate seconds after the first read."""
+
+    def __init__(self, payload: bytes, bytes_per_sec: float):
+        self._buf = io.BytesIO(payload)
+        self._rate = bytes_per_sec
+        self._t0 = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        self._t0 = self._t0 or time.perf_counter()
+        n = self._buf.readinto(b)
+        wait = self._t0 + self._buf.tell() / self._rate - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        return n
+
+
+def response(payload: bytes, bytes_per_sec: float | None = None) -> requests.Response:
+    r = requests.Response()
+    r.status_code, r.encoding = 200, "utf-8"
+    r.raw = io.BufferedReader(Trickle(payload, bytes_per_sec)) if bytes_per_sec else io.BytesIO(payload)
+    return r
+
+
+# The current approach: parse everything, keep a few fields
+def full_pulls(r):
+    return [{"number": p["number"], "head_sha": p["head"]["sha"], "base": p["base"]["ref"],
+             "url": p["html_url"], "labels": [l["name"] for l in p.get("labels", [])]} for p in r.json()]
+
+
+def full_first_pull(r):
+    return full_pulls(r)[:1]
+
+
+def full_issues(r):
+    return [{"title": it["title"], "labels": [l["name"] for l in it["labels"]], "url": it["html_url"]} for it in r.json()]
+
+
+def full_checks(r):
+    return [{"name": c["name"], "conclusion": c["conclusion"], "url": c["html_url"]} for c in r.json()["check_runs"]]
+
+
+def stream_pulls(r):
+    return [{"number": p["number"], "head_sha": p["head.sha"], "base": p["base.ref"], "url": p["html_url"],
+             "labels": p["labels.item.name"]} for p in gt._project(r, "item", gt.PR_FIELDS)]
+
+
+def stream_first_pull(r):
+    # What get_open_pr does: stop at the first matching element
+    for p in gt._project(r, "item", gt.PR_FIELDS):
+        return [{"number": p["number"], "head_sha": p["head.sha"], "base": p["base.ref"], "url": p["html_url"],
+                 "labels": p["labels.item.name"]}]
+    return []
+
+
+def stream_issues(r):
+    return [{"title": it["title"], "labels": it["labels.item.name"], "url": it["html_url"]}
+            for it in gt._project(r, "item", gt.ISSUE_FIELDS)]
+
+
+def stream_checks(r):
+    return [{"name": c["name"], "conclusion": c["conclusion"], "url": c["html_url"]}
+            for c in gt._project(r, "check_runs.item", gt.CHECK_RUN_FIELDS)]
+
+
+def best_of(fn, payload, repeat, bytes_per_sec=None):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(response(payload, bytes_per_sec))
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def measure(fn, payload, repeat, bytes_per_sec):
+    out, t_cpu = best_of(fn, payload, repeat)
+    _, t_net = best_of(fn, payload, max(1, repeat // 2), bytes_per_sec)
+    tracemalloc.start()
+    fn(response(payload))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, t_cpu, t_net, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GitHub listing parse benchmark")
+    ap.add_argument("--items", type=int, default=300, help="Elements per synthetic payload")
+    ap.add_argument("--repeat", type=int, default=5, help="Timing repeats (best-of)")
+    ap.add_argument("--mbps", type=float, default=20.0, help="Simulated download rate in MB/s")
+    args = ap.parse_args()
+
+    pulls = json.dumps([fake_pull(i) for i in range(args.items)]).encode()
+    cases = [
+        ("pulls", pulls, full_pulls, stream_pulls),
+        ("first_pull", pulls, full_first_pull, stream_first_pull),
+        ("issues", json.dumps([fake_issue(i) for i in range(args.items)]).encode(), full_issues, stream_issues),
+        ("check_runs", json.dumps({"total_count": args.items, "check_runs": [fake_check_run(i) for i in range(args.items)]}).encode(),
+         full_checks, stream_checks),
+    ]
+    print(f"ijson backend: {gt.ijson.backend if gt.ijson else '(not installed: fallback path)'}")
+    rate = args.mbps * 1e6
+    net = f"@{args.mbps:g}MB/s"
+    print(f"{'':<18} | {'in memory (ms)':^17} | {net + ' (ms)':^17} | {'peak MB':^15}")
+    print(f"{'payload':<11} {'MB':>6} | {'full':>8} {'stream':>8} | {'full':>8} {'stream':>8} | {'full':>7} {'stream':>7}")
+    for name, payload, full_fn, stream_fn in cases:
+        a, c_full, n_full, m_full = measure(full_fn, payload, args.repeat, rate)
+        b, c_stream, n_stream, m_stream = measure(stream_fn, payload, args.repeat, rate)
+        assert a == b, f"{name}: projections differ"
+        print(f"{name:<11} {len(payload) / 1e6:6.2f} | {c_full * 1e3:8.1f} {c_stream * 1e3:8.1f} | "
+              f"{n_full * 1e3:8.1f} {n_stream * 1e3:8.1f} | {m_full / 1e6:7.2f} {m_stream / 1e6:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# gatekeeper/checkpoint.py
+"""
+Persistent (SQLite) checkpointing for the gate graph.
+
+Each gate run gets a LangGraph thread id derived from (repo, base branch, head SHA,
+blocker labels, judge settings), so a re-run against the same candidate resumes
+after the last completed node instead of re-judging.
+
+Signals (Actions run, check runs, blockers) are always fetched again, since
+they can change for the same head SHA (re-runs, newly filed blockers). A stored
+verdict is reused only when those signals are unchanged and the verdict is
+reusable (no judge error, no evidence violation); otherwise the graph continues
+from the fresh signals on the same thread.
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Optional
+
+from gatekeeper.state import GateState
+from gatekeeper.graph import node_fetch_signals, node_select_target
+from gatekeeper.judge import _cacheable
+
+__all__ = ["open_checkpointer", "thread_id_for", "run_checkpointed", "is_reusable"]
+
+# configurable keys that change what a run decides, so they are part of the thread id
+THREAD_CONFIG_KEYS = ("model", "escalate_model", "min_confidence", "stream_judge", "failure_logs")
+
+
+def open_checkpointer(path: str):
+    """Open (or create) a SQLite checkpoint store at `path`."""
+    # Optional dependency: only needed when checkpointing is enabled
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    return SqliteSaver(conn)
+
+
+def thread_id_for(
+    repo: str,
+    base_branch: str,
+    head_sha: str | None,
+    blocker_labels: str = "",
+    configurable: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable thread id for one gate evaluation of a specific commit under one judge setup."""
+    judge = {k: (configurable or {}).get(k) for k in THREAD_CONFIG_KEYS}
+    raw = "|".join([repo, base_branch, head_sha or "", blocker_labels, json.dumps(judge, sort_keys=True, default=str)])
+    return f"{repo}@{base_branch}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _signals(values: Dict[str, Any]) -> tuple:
+    return (
+        (values.get("actions") or {}).get("latest_run") or {},
+        (values.get("checks") or {}).get("runs") or [],
+        values.get("blockers") or [],
+    )
+
+
+def is_reusable(values: Dict[str, Any]) -> bool:
+    """
+    A stored verdict may be handed back for unchanged signals unless the judge
+    failed: same rule as the judge cache, plus a failed evidence check.
+    """
+    return _cacheable(values) and (values.get("judge") or {}).get("verified", True)
+
+
+def run_checkpointed(graph, state: GateState, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a graph compiled with a checkpointer:
+      - new thread, or interrupted before fetch_signals -> run / resume normally
+      - otherwise signals are refetched first:
+          unchanged + finished + reusable verdict -> return the stored state (no LLM call)
+          unchanged + interrupted                 -> resume from the last completed node
+          anything else                           -> continue from the fresh signals
+    The target is resolved up front because the head SHA is part of the thread id.
+    """
+    state = node_select_target(state)
+    configurable = config.get("configurable", {})
+    tid = thread_id_for(
+        state["repo"], state["base_branch"], state.get("head_sha"), state.get("blocker_labels", ""), configurable
+    )
+    config = {**config, "configurable": {**configurable, "thread_id": tid}}
+
+    snapshot = graph.get_state(config)
+    if not snapshot.values:
+        return graph.invoke(state, config)
+    if "fetch_signals" in snapshot.next:
+        return graph.invoke(None, config)
+
+    fresh = node_fetch_signals(copy.deepcopy(state))
+    if _signals(fresh) == _signals(snapshot.values):
+        if snapshot.next:
+            return graph.invoke(None, config)
+        if is_reusable(snapshot.values):
+            return snapshot.values
+    # Replace the stored run with the fresh signals and continue after fetch_signals
+    graph.update_state(config, fresh, as_node="fetch_signals")
+    return graph.invoke(None, config)
@@ -0,0 +1,109 @@
+# gatekeeper/fleet.py
+"""
+Fleet worker: pull repo jobs from a shared WorkQueue until it is drained.
+
+Start as many `main.py --queue Q --worker` processes as you like, on any host
+that sees the queue file; they coordinate only through the queue and the
+shared cache.
+"""
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils.work_queue import Job, WorkQueue
+
+__all__ = ["run_worker", "format_progress", "default_worker_id"]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def format_progress(progress: Dict[str, Any], counters: Optional[Dict[str, int]] = None) -> str:
+    p = progress
+    line = (
+        f"[fleet] {p['done']}/{p['total']} done, {p['failed']} failed, "
+        f"{p['pending']} pending, {p['leased']} running on {p['active_workers']} worker(s) | "
+        f"{p['jobs_per_min']} jobs/min overall, {p['recent_jobs_per_min']} recent"
+    )
+    if p.get("eta_sec") is not None:
+        line += f" | ETA {p['eta_sec']:.0f}s"
+    if counters:
+        line += " | " + ", ".join(f"{k}={v}" for k, v in sorted(counters.items()))
+    return line
+
+
+@contextmanager
+def _keep_lease(queue: WorkQueue, job_id: int, worker_id: str) -> Iterator[None]:
+    """
+    Renew the job's lease every lease_seconds/3 while the body runs, so a slow
+    gate (e.g. waiting out the shared GitHub quota) is not re-claimed mid-run.
+    Renewal stops with the process, so a dead worker's lease still expires.
+    """
+    stop = threading.Event()
+
+    def beat():
+        # sqlite connections are per thread
+        own = WorkQueue(queue.path, lease_seconds=queue.lease_seconds)
+        while not stop.wait(queue.lease_seconds / 3):
+            if not own.renew(job_id, worker_id):
+                break
+
+    thread = threading.Thread(target=beat, name=f"lease-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(
+    queue: WorkQueue,
+    gate_fn: Callable[[Job], Dict[str, Any]],
+    worker_id: Optional[str] = None,
+    report_every: float = 30.0,
+    counters_fn: Optional[Callable[[], Dict[str, int]]] = None,
+    log: Callable[[str], None] = print,
+    poll_interval: float = 30.0,
+) -> Dict[str, int]:
+    """
+    Claim -> gate -> store until no job is pending or leased. While jobs are only
+    waiting out a retry backoff or held by other workers, sleep until the earliest
+    of them could be claimed (at most `poll_interval`, to notice new jobs).
+    The lease is renewed while a gate runs; a crash mid-job leaves it to expire
+    so another worker retries the job (at-least-once); a result that arrives after the lease was taken over is
+    dropped and counted as "lost".
+    """
+    worker_id = worker_id or default_worker_id()
+    stats = {"done": 0, "failed": 0, "lost": 0}
+    last_report = time.time()
+
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            ready = queue.next_ready()
+            if ready is None:
+                break
+            # Jobs remain but are backing off or leased elsewhere: wait, don't exit
+            time.sleep(min(max(ready - time.time(), 0.1), poll_interval))
+        else:
+            try:
+                with _keep_lease(queue, job["id"], worker_id):
+                    result = gate_fn(job)
+            except Exception as e:
+                stored = queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+                stats["failed" if stored else "lost"] += 1
+            else:
+                stored = queue.complete(job["id"], worker_id, result)
+                stats["done" if stored else "lost"] += 1
+
+        if time.time() - last_report >= report_every:
+            log(format_progress(queue.progress(), counters_fn() if counters_fn else None))
+            last_report = time.time()
+
+    log(format_progress(queue.progress(), counters_fn() if counters_fn else None))
+    return stats
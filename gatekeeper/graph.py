@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from gatekeeper.state import GateState, default_state        
 from tools.github_tools import (                
@@ -8,16 +10,25 @@ from tools.github_tools import (
     get_latest_run_for_sha,
     get_check_runs,
     get_blockers,
+    get_job_log_errors,
+    job_id_from_url,
 )
 from .state import GateState, default_state
-from gatekeeper.judge import llm_decide
-from gatekeeper.verifier import verify_evidence
+from gatekeeper.judge import judge_cascade
 from gatekeeper.summarizer import make_summary_md
 
+DEFAULT_MODEL = "gemini-1.5-flash-002"
+
+def _configurable(config: RunnableConfig | None) -> dict:
+    return (config or {}).get("configurable", {}) or {}
+
 # ---------- Nodes ----------
 
 def node_select_target(state: GateState) -> GateState:
     """Pick a release candidate PR (base branch) or fall back to branch head commit."""
+    if state.get("head_sha"):
+        # Already resolved (e.g. up front to derive a checkpoint thread id)
+        return state
     repo = state["repo"]
     base = state["base_branch"]
     # set a label if you want stricter gating
@@ -86,13 +97,46 @@ def node_redline_check(state: GateState) -> GateState:
         state["awaiting_llm"] = True  
     return state
 
+def node_fetch_failure_logs(state: GateState, config: RunnableConfig = None) -> GateState:
+    """
+    Optional (configurable failure_logs=True): stream the logs of failed Actions
+    jobs concurrently and keep their top error lines for the digest.
+    log_max_bytes is split evenly across jobs so one huge log can't starve the rest.
+    """
+    conf = _configurable(config)
+    if not conf.get("failure_logs"):
+        return state
+
+    failed = [r for r in state.get("checks", {}).get("runs", []) if _is_failed_conclusion(r.get("conclusion"))]
+    jobs = [(r, job_id_from_url(r.get("url"))) for r in failed[:int(conf.get("log_max_checks", 10))]]
+    jobs = [(r, jid) for r, jid in jobs if jid is not None]
+    if not jobs:
+        return state
+
+    per_job = max(1, int(conf.get("log_max_bytes", 64 * 1024 * 1024)) // len(jobs))
+    max_lines = int(conf.get("log_max_lines", 5))
+
+    def fetch(item):
+        run, job_id = item
+        entry = {"name": run.get("name"), "url": run.get("url")}
+        try:
+            entry.update(get_job_log_errors(state["repo"], job_id, max_bytes=per_job, max_lines=max_lines))
+        except Exception as e:
+            entry.update(lines=[], bytes=0, truncated=False, error=f"{type(e).__name__}: {e}"[:200])
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, int(conf.get("log_concurrency", 4)))) as pool:
+        state["failure_logs"] = list(pool.map(fetch, jobs))
+    return state
+
 def redline_router(state: GateState) -> Literal["NO_GO", "NEEDS_LLM"]:
     """Route based on redline outcome."""
     return "NO_GO" if state.get("decision") == "NO_GO" else "NEEDS_LLM"
 
 # --- Stub nodes for Part 2 (real logic comes in Part 3) ---
 
-def node_llm_judge(state: GateState) -> GateState:
+def node_llm_judge(state: GateState, config: RunnableConfig = None) -> GateState:
+    """Cheap-model-first judge; escalates per judge_cascade when configured with escalate_model."""
     if not state.get("awaiting_llm"):
         return state
 
@@ -111,8 +155,21 @@ def node_llm_judge(state: GateState) -> GateState:
         "blockers": state.get("blockers", []),
     }
 
-    judge = llm_decide(signals)
-    verified, violations = verify_evidence(judge, signals)
+    conf = _configurable(config)
+    models = [conf.get("model") or DEFAULT_MODEL]
+    if conf.get("escalate_model") and conf["escalate_model"] not in models:
+        models.append(conf["escalate_model"])
+    outcome = judge_cascade(
+        signals,
+        models,
+        min_confidence=float(conf.get("min_confidence", 0.8)),
+        stream=bool(conf.get("stream_judge")),
+        reask=bool(conf.get("stream_reask", True)),
+    )
+    judge, verified, violations = outcome["judge"], outcome["verified"], outcome["violations"]
+    state["judge"] = {
+        "tier": outcome["tier"], "model": outcome["model"], "escalations": outcome["escalations"], "verified": verified,
+    }
 
     if not verified:
         state["decision"] = "PAUSE"
@@ -137,9 +194,9 @@ def node_report(state: GateState) -> GateState:
     """Report Generation: No-op here. CLI in Part 4 will render a nice report from the state."""   
     return state
 
-def node_summarize(state: GateState) -> GateState:
-    # Use same model as judge or default
-    summary = make_summary_md(state, model="gemini-1.5-flash-002")
+def node_summarize(state: GateState, config: RunnableConfig = None) -> GateState:
+    # The digest is low-stakes: always use the cheap tier
+    summary = make_summary_md(state, model=_configurable(config).get("model") or DEFAULT_MODEL)
     state["summary_md"] = summary
     return state
 
@@ -151,6 +208,7 @@ def build_graph() -> StateGraph:
     g.add_node("select_target", node_select_target)
     g.add_node("fetch_signals", node_fetch_signals)
     g.add_node("redline_check", node_redline_check)
+    g.add_node("fetch_failure_logs", node_fetch_failure_logs)
     g.add_node("llm_judge", node_llm_judge)
     g.add_node("summarize", node_summarize)
     g.add_node("report", node_report)
@@ -162,12 +220,13 @@ def build_graph() -> StateGraph:
         "redline_check",
         redline_router,
         {
-             # go summarize directly
-            "NO_GO": "summarize",    
+             # collect failure log excerpts (no-op unless enabled), then summarize
+            "NO_GO": "fetch_failure_logs",
             # judge first
             "NEEDS_LLM": "llm_judge", 
         },
     )
+    g.add_edge("fetch_failure_logs", "summarize")
     # judge -> summarize
     g.add_edge("llm_judge", "summarize")   
     # summarize -> report
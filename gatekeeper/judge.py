@@ -1,12 +1,16 @@
 # gatekeeper/judge.py
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
 
 from pydantic import BaseModel, Field          #Pydantic v2
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 import json
 
-__all__ = ["llm_decide"]
+from utils.cassette import get_cassette, request_key
+from utils.shared_cache import get_shared_cache
+from gatekeeper.verifier import verify_evidence, verify_item
+
+__all__ = ["llm_decide", "judge_cascade"]
 
 # ---- Pydantic schemas Gemini must output ----
 class EvidenceItem(BaseModel):
@@ -44,15 +48,73 @@ USER_TMPL = (
     "Also Act as summarizer at the end to showcase the developer that what is the end result to developer in human language"
 )
 
+# Streaming mode: plain JSON text (evidence first, so bad citations surface early)
+STREAM_TMPL = (
+    "\n\nOutput format: a single JSON object with keys in this order: "
+    "decision, evidence, reasons, policy_violations, confidence. "
+    "It must validate against this JSON Schema:\n{schema}"
+)
+
+REASK_TMPL = (
+    "Your previous answer was stopped because this evidence does not match the signals:\n"
+    "{violation}\n"
+    "Answer again from scratch. Cite only paths and values that exist in the signals JSON."
+)
+
 def llm_decide(
     signals: Dict[str, Any],
     model: str = "gemini-1.5-flash-002",
     temperature: float = 0.1,
+    stream: bool = False,
+    reask: bool = True,
 ) -> Dict[str, Any]:
     """
     Ask Gemini for a structured decision. Returns a dict compatible with JudgeResponse.
     On any model/parse error, returns a safe PAUSE decision.
+    stream=True verifies evidence while the answer is generated (see _llm_decide_stream).
     """
+    request = {"model": model, "temperature": temperature, "signals": signals}
+    if stream:
+        request.update(stream=True, reask=reask)
+    call = lambda: _cached_llm_decide(request, signals, model, temperature, stream, reask)
+    cassette = get_cassette()
+    if cassette is None:
+        return call()
+    return cassette.exchange("llm_decide", request, call)
+
+def _cached_llm_decide(
+    request: Dict[str, Any], signals: Dict[str, Any], model: str, temperature: float, stream: bool, reask: bool
+) -> Dict[str, Any]:
+    """
+    Consult the fleet-wide judge cache (if any). Judge errors and evidence
+    violations are never cached, so another worker gets a fresh attempt.
+    """
+    def call():
+        if stream:
+            return _llm_decide_stream(signals, model, temperature, reask)
+        return _llm_decide(signals, model, temperature)
+
+    shared = get_shared_cache()
+    if shared is None:
+        return call()
+    key = request_key(request)
+    hit = shared.get_judge(key)
+    if hit is not None:
+        shared.incr("judge_cache_hits")
+        return hit
+    result = call()
+    shared.incr("judge_calls")
+    if _cacheable(result):
+        shared.put_judge(key, result)
+    return result
+
+def _cacheable(result: Dict[str, Any]) -> bool:
+    return not any(
+        v == "STRUCTURED_OUTPUT_ERROR" or str(v).startswith("EVIDENCE_VIOLATION:")
+        for v in result.get("policy_violations", [])
+    )
+
+def _llm_decide(signals: Dict[str, Any], model: str, temperature: float) -> Dict[str, Any]:
     try:
         llm = ChatGoogleGenerativeAI(
             model=model,
@@ -71,10 +133,170 @@ def llm_decide(
         )
         return result.model_dump()  # pydantic v2 dict()
     except Exception as e:
+        return _error_decision(e)
+
+def _error_decision(e: Exception) -> Dict[str, Any]:
+    return {
+        "decision": "PAUSE",
+        "reasons": [f"Judge error: {type(e).__name__}"],
+        "evidence": [],
+        "policy_violations": ["STRUCTURED_OUTPUT_ERROR"],
+        "confidence": 0.0,
+    }
+
+# ---- Streaming judge ----
+
+class _EvidenceScanner:
+    """
+    Incremental JSON scanner over streamed model text: yields (index, item) for
+    each object in the top-level "evidence" array as soon as its closing brace
+    arrives. Only tracks string/escape state and nesting depth; the full text is
+    still parsed properly at the end.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._str_start = 0
+        self._last_key: Optional[str] = None
+        self._in_evidence = False
+        self._item_start: Optional[int] = None
+        self._count = 0
+
+    def feed(self, chunk: str) -> Iterator[Tuple[int, Any]]:
+        start = len(self.text)
+        self.text += chunk
+        for pos in range(start, len(self.text)):
+            c = self.text[pos]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                    if self._depth == 1:
+                        self._last_key = self.text[self._str_start + 1:pos]
+            elif c == '"':
+                self._in_str, self._str_start = True, pos
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 2 and c == "[" and self._last_key == "evidence":
+                    self._in_evidence = True
+                elif self._in_evidence and self._depth == 3:
+                    self._item_start = pos
+            elif c in "}]":
+                if self._in_evidence and self._depth == 3 and self._item_start is not None:
+                    item = json.loads(self.text[self._item_start:pos + 1])
+                    self._item_start = None
+                    yield self._count, item
+                    self._count += 1
+                elif self._in_evidence and self._depth == 2:
+                    self._in_evidence = False
+                self._depth -= 1
+
+def _chunk_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in content or [])
+
+def _json_body(text: str) -> str:
+    """Drop anything around the outermost object (e.g. stray code fences)."""
+    return text[text.find("{"):text.rfind("}") + 1]
+
+def _stream_once(llm, messages, signals: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Stream one answer; stop generating at the first evidence item that fails verification."""
+    scanner = _EvidenceScanner()
+    chunks = llm.stream(messages)
+    try:
+        for chunk in chunks:
+            for i, item in scanner.feed(_chunk_text(chunk.content)):
+                violation = (
+                    verify_item(i, item, signals) if isinstance(item, dict)
+                    else f"evidence[{i}]: not an object"
+                )
+                if violation:
+                    return scanner.text, violation
+    finally:
+        # Abandoning the stream cancels the rest of the generation
+        chunks.close()
+    return scanner.text, None
+
+def _llm_decide_stream(signals: Dict[str, Any], model: str, temperature: float, reask: bool) -> Dict[str, Any]:
+    """
+    Streaming variant of _llm_decide: evidence is verified item by item as it is
+    generated; the first hallucinated path/value aborts the generation and, if
+    `reask`, the model gets one more try with the violation attached. A second
+    violation yields PAUSE with the violations listed.
+    """
+    try:
+        llm = ChatGoogleGenerativeAI(model=model, temperature=temperature, response_mime_type="application/json")
+        signals_json = json.dumps(signals, ensure_ascii=False, separators=(",", ":"))
+        schema = json.dumps(JudgeResponse.model_json_schema(), separators=(",", ":"))
+        user_msg = USER_TMPL.replace("{signals}", signals_json) + STREAM_TMPL.replace("{schema}", schema)
+        messages = [SystemMessage(content=SYSTEM), HumanMessage(content=user_msg)]
+
+        violations: List[str] = []
+        for _ in range(2 if reask else 1):
+            text, violation = _stream_once(llm, messages, signals)
+            if violation is None:
+                return JudgeResponse.model_validate_json(_json_body(text)).model_dump()
+            violations.append(violation)
+            messages = [
+                *messages,
+                AIMessage(content=text),
+                HumanMessage(content=REASK_TMPL.replace("{violation}", violation)),
+            ]
         return {
             "decision": "PAUSE",
-            "reasons": [f"Judge error: {type(e).__name__}"],
+            "reasons": ["Judge cited evidence that does not match the signals; generation stopped early."],
             "evidence": [],
-            "policy_violations": ["STRUCTURED_OUTPUT_ERROR"],
+            # The re-ask often repeats the same mistake; list it once
+            "policy_violations": [f"EVIDENCE_VIOLATION: {v}" for v in dict.fromkeys(violations)],
             "confidence": 0.0,
         }
+    except Exception as e:
+        return _error_decision(e)
+
+
+def judge_cascade(
+    signals: Dict[str, Any],
+    models: Sequence[str],
+    min_confidence: float = 0.8,
+    temperature: float = 0.1,
+    stream: bool = False,
+    reask: bool = True,
+) -> Dict[str, Any]:
+    """
+    Ask `models` cheapest-first. A tier's answer is accepted when its evidence
+    verifies, it is not PAUSE, and confidence >= min_confidence; otherwise we
+    escalate. The last tier's answer is final whatever it says.
+    Returns {judge, verified, violations, tier, model, escalations}.
+    """
+    escalations: List[str] = []
+    for tier, model in enumerate(models):
+        judge = llm_decide(signals, model=model, temperature=temperature, stream=stream, reask=reask)
+        verified, violations = verify_evidence(judge, signals)
+        confidence = float(judge.get("confidence", 0.0) or 0.0)
+
+        why = []
+        if not verified:
+            why.append(f"{len(violations)} evidence violation(s)")
+        if judge.get("decision") == "PAUSE":
+            why.append("PAUSE")
+        if confidence < min_confidence:
+            why.append(f"confidence {confidence:.2f} < {min_confidence:.2f}")
+        if not why or tier == len(models) - 1:
+            break
+        escalations.append(f"{model}: " + ", ".join(why))
+
+    return {
+        "judge": judge,
+        "verified": verified,
+        "violations": violations,
+        "tier": tier,
+        "model": model,
+        "escalations": escalations,
+    }
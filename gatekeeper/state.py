@@ -21,6 +21,20 @@ class Issue(TypedDict, total=False):
     labels: List[str]
     url: str
 
+class FailureLog(TypedDict, total=False):
+    name: str                   # check run name
+    url: str
+    lines: List[str]            # top error lines from the job log
+    bytes: int                  # log bytes scanned
+    truncated: Optional[bool]   # stopped before the end of the log (None: stopped early, size unknown)
+    error: str                  # why the log could not be read
+
+class JudgeInfo(TypedDict, total=False):
+    tier: int                   # 0 = cheapest model in the cascade
+    model: str                  # model whose decision was used
+    escalations: List[str]      # why each cheaper tier was passed over
+    verified: bool              # evidence of the used answer checked out
+
 class GateState(TypedDict, total=False):
     # Inputs / config
     repo: str
@@ -36,6 +50,7 @@ class GateState(TypedDict, total=False):
     actions: ActionsInfo
     checks: ChecksInfo
     blockers: List[Issue]
+    failure_logs: List[FailureLog]
 
     # Decision artifacts
     decision: Decision
@@ -43,6 +58,7 @@ class GateState(TypedDict, total=False):
     evidence: List[Dict[str, Any]]
     policy_violations: List[str]
     confidence: float
+    judge: JudgeInfo
 
     # Flow control
     awaiting_llm: bool
@@ -60,11 +76,13 @@ def default_state(repo: str, base_branch: str = "main", blocker_labels: str = "r
         actions=ActionsInfo(),
         checks=ChecksInfo(required=[], runs=[]),
         blockers=[],
+        failure_logs=[],
         decision="UNKNOWN",
         reasons=[],
         evidence=[],
         policy_violations=[],
         confidence=0.0,
+        judge=JudgeInfo(),
         awaiting_llm=False,
         summary_md=""
     )
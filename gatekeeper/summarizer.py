@@ -3,6 +3,8 @@ from typing import Dict, Any, List
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from utils.cassette import get_cassette
+
 SYSTEM = (
     "You are a senior release engineer. Write a concise, factual, developer-facing summary "
     "based ONLY on the provided inputs. Do not speculate. Keep it under 160 words. "
@@ -17,6 +19,7 @@ USER_TMPL = (
     "Confidence: {confidence}\n"
     "Reasons:\n{reasons}\n"
     "Checks Summary:\n{checks_lines}\n"
+    "Failure Log Excerpts:\n{failure_lines}\n"
     "Blockers Count: {blockers_count}\n"
     "PR URL: {pr_url}\n"
     "Workflow URL: {run_url}\n"
@@ -35,6 +38,27 @@ def _checks_lines(checks: List[Dict[str, Any]]) -> str:
         out.append(f"- ... and {len(checks) - 12} more")
     return "\n".join(out)
 
+def _failure_lines(logs: List[Dict[str, Any]]) -> str:
+    if not logs:
+        return "- (not collected)"
+    out = []
+    for log in logs:
+        if log.get("error"):
+            out.append(f"- {log.get('name')}: log unavailable ({log['error']})")
+            continue
+        out.append(f"- {log.get('name')}:" + ("" if log.get("lines") else " (no error lines found)"))
+        out.extend(f"  - {line}" for line in log.get("lines", []))
+    return "\n".join(out)
+
+def _ask_llm(user: str, model: str) -> str | None:
+    """Return the model's Markdown, or None on any model error (caller falls back)."""
+    try:
+        llm = ChatGoogleGenerativeAI(model=model, temperature=0.2)
+        resp = llm.invoke([SystemMessage(content=SYSTEM), HumanMessage(content=user)])
+        return (resp.content or "").strip()
+    except Exception:
+        return None
+
 def make_summary_md(state: Dict[str, Any], model: str = "gemini-1.5-flash-002") -> str:
     repo = state["repo"]
     decision = state.get("decision", "UNKNOWN")
@@ -49,6 +73,7 @@ def make_summary_md(state: Dict[str, Any], model: str = "gemini-1.5-flash-002")
     # Build plain-text inputs (no JSON/braces to avoid formatting issues)
     reasons_lines = "\n".join([f"- {r}" for r in reasons]) or "- (none)"
     checks_lines = _checks_lines(checks)
+    failure_lines = _failure_lines(state.get("failure_logs", []) or [])
     target = f"PR #{pr.get('number')}" if pr else f"branch head ({state.get('base_branch')})"
 
     user = USER_TMPL.format(
@@ -58,22 +83,28 @@ def make_summary_md(state: Dict[str, Any], model: str = "gemini-1.5-flash-002")
         confidence=confidence,
         reasons=reasons_lines,
         checks_lines=checks_lines,
+        failure_lines=failure_lines,
         blockers_count=blockers_count,
         pr_url=pr_url,
         run_url=run_url,
     )
 
-    try:
-        llm = ChatGoogleGenerativeAI(model=model, temperature=0.2)
-        resp = llm.invoke([SystemMessage(content=SYSTEM), HumanMessage(content=user)])
-        return (resp.content or "").strip()
-    except Exception:
+    cassette = get_cassette()
+    if cassette is None:
+        text = _ask_llm(user, model)
+    else:
+        text = cassette.exchange("make_summary_md", {"model": model, "user": user}, lambda: _ask_llm(user, model))
+
+    if text is None:
         # Fallback: deterministic summary
         lines = []
         lines.append("Overview")
         lines.append(f"{repo}: decision **{decision}** (confidence {confidence}).")
         lines.append("\nSignals")
         lines.append(checks_lines)
+        if state.get("failure_logs"):
+            lines.append("\nFailure Log Excerpts")
+            lines.append(failure_lines)
         lines.append("\nDecision & Rationale")
         lines.append(reasons_lines)
         links = []
@@ -90,3 +121,4 @@ def make_summary_md(state: Dict[str, Any], model: str = "gemini-1.5-flash-002")
         else:
             lines.append("- Clarify missing signals or address flagged risks, then re-run.")
         return "\n".join(lines)
+    return text
@@ -59,30 +59,27 @@ def _normalize_path(raw_path: str | None, source: str | None) -> str | None:
 
     return path
 
-def verify_evidence(judge: Dict[str, Any], signals: Dict[str, Any]) -> Tuple[bool, List[str]]:
-    """Ensure every evidence item maps to an actual value in signals and matches."""
-    violations: List[str] = []
-    ev: List[Dict[str, Any]] = judge.get("evidence", [])
-
-    for i, item in enumerate(ev):
-        src = item.get("source")
-        raw_path = item.get("path")
-        npath = _normalize_path(raw_path, src)
-        if npath is None:
-            violations.append(f"evidence[{i}]: missing/invalid path")
-            continue
+def verify_item(i: int, item: Dict[str, Any], signals: Dict[str, Any]) -> str | None:
+    """Check one evidence item; returns a violation message or None if it holds."""
+    src = item.get("source")
+    raw_path = item.get("path")
+    npath = _normalize_path(raw_path, src)
+    if npath is None:
+        return f"evidence[{i}]: missing/invalid path"
 
-        actual = _get_by_path(signals, npath)
-        if actual is None:
-            violations.append(f"evidence[{i}]: path '{raw_path}' -> '{npath}' not found")
-            continue
+    actual = _get_by_path(signals, npath)
+    if actual is None:
+        return f"evidence[{i}]: path '{raw_path}' -> '{npath}' not found"
 
-        claimed = item.get("value", None)
-        # Loose equality across JSON types
-        if str(actual) != str(claimed):
-            violations.append(
-                f"evidence[{i}]: value mismatch at '{npath}': actual={actual!r} claimed={claimed!r}"
-            )
+    claimed = item.get("value", None)
+    # Loose equality across JSON types
+    if str(actual) != str(claimed):
+        return f"evidence[{i}]: value mismatch at '{npath}': actual={actual!r} claimed={claimed!r}"
+    return None
 
+def verify_evidence(judge: Dict[str, Any], signals: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """Ensure every evidence item maps to an actual value in signals and matches."""
+    ev: List[Dict[str, Any]] = judge.get("evidence", [])
+    violations = [v for v in (verify_item(i, item, signals) for i, item in enumerate(ev)) if v]
     ok = len(violations) == 0
     return ok, violations
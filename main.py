@@ -9,12 +9,28 @@ import shutil
 from dotenv import load_dotenv
 
 from utils.repo_normalize import normalize_repo
+from utils.cassette import Cassette, set_cassette
+from utils.shared_cache import SharedCache, get_shared_cache, set_shared_cache
+from utils.work_queue import WorkQueue
+from tools.issue_index import set_index_root
 from gatekeeper.state import default_state
 from gatekeeper.graph import build_graph
+from gatekeeper.checkpoint import open_checkpointer, run_checkpointed
+from gatekeeper.fleet import run_worker
 
 
 # ---------- rendering ----------
 
+def judge_line(state: Dict[str, Any]) -> str | None:
+    """e.g. 'gemini-1.5-pro-002 (tier 1; escalated: gemini-1.5-flash-002: PAUSE)'."""
+    judge = state.get("judge") or {}
+    if not judge.get("model"):
+        return None
+    line = f"{judge['model']} (tier {judge.get('tier', 0)}"
+    if judge.get("escalations"):
+        line += "; escalated: " + " | ".join(judge["escalations"])
+    return line + ")"
+
 def render_pretty(state: Dict[str, Any]) -> str:
     lines = []
     lines.append("=== Release Gatekeeper ===")
@@ -23,6 +39,9 @@ def render_pretty(state: Dict[str, Any]) -> str:
     conf = state.get("confidence")
     if conf is not None:
         lines.append(f"Confidence: {conf}")
+    jl = judge_line(state)
+    if jl:
+        lines.append(f"Judge: {jl}")
     lines.append("Reasons:")
     for r in state.get("reasons", []):
         lines.append(f" - {r}")
@@ -42,6 +61,13 @@ def render_pretty(state: Dict[str, Any]) -> str:
     lr = state.get("actions", {}).get("latest_run")
     if lr:
         lines.append(f"Latest run: {lr}")
+    fl = state.get("failure_logs", [])
+    if fl:
+        lines.append("Failure logs:")
+        for log in fl:
+            lines.append(f" - {log.get('name')}: {log.get('error') or log.get('url')}")
+            for line in log.get("lines", []):
+                lines.append(f"     {line}")
     lines.append(f"Checks (count): {len(state.get('checks', {}).get('runs', []))}")
     lines.append(f"Blockers (count): {len(state.get('blockers', []))}")
     if state.get("summary_md"):
@@ -57,6 +83,9 @@ def render_md(state: Dict[str, Any]) -> str:
     lines.append(f"- **Decision:** **{state.get('decision')}**")
     if state.get("confidence") is not None:
         lines.append(f"- **Confidence:** {state['confidence']}")
+    jl = judge_line(state)
+    if jl:
+        lines.append(f"- **Judge:** {jl}")
     lines.append("\n## Reasons")
     for r in state.get("reasons", []):
         lines.append(f"- {r}")
@@ -78,6 +107,13 @@ def render_md(state: Dict[str, Any]) -> str:
     if lr:
         lines.append("\n## Latest run")
         lines.append(f"- `{lr}`")
+    fl = state.get("failure_logs", [])
+    if fl:
+        lines.append("\n## Failure log excerpts")
+        for log in fl:
+            lines.append(f"- **{log.get('name')}** ({log.get('error') or log.get('url')})")
+            for line in log.get("lines", []):
+                lines.append(f"  - `{line}`")
     lines.append("\n## Counts")
     lines.append(f"- Checks: {len(state.get('checks', {}).get('runs', []))}")
     lines.append(f"- Blockers: {len(state.get('blockers', []))}")
@@ -134,10 +170,79 @@ def clean_caches(root: str = ".", skip: set[str] = DEFAULT_CLEAN_SKIP, verbose:
     return deleted
 
 
+# ---------- JSON result ----------
+def result_subset(final: Dict[str, Any], dt: float) -> Dict[str, Any]:
+    """Minimal stable JSON subset of a final state."""
+    return {
+        "repo": final.get("repo"),
+        "decision": final.get("decision"),
+        "confidence": final.get("confidence"),
+        "judge": final.get("judge") or None,
+        "reasons": final.get("reasons", []),
+        "evidence": final.get("evidence", []),
+        "policy_violations": final.get("policy_violations", []),
+        "pr": final.get("pr"),
+        "latest_run": final.get("actions", {}).get("latest_run"),
+        "checks_count": len(final.get("checks", {}).get("runs", [])),
+        "blockers_count": len(final.get("blockers", [])),
+        "failure_logs": final.get("failure_logs", []),
+        "elapsed_sec": round(dt, 2),
+    }
+
+
+def compile_graph(checkpoint_db: str | None):
+    if checkpoint_db:
+        return build_graph().compile(checkpointer=open_checkpointer(checkpoint_db))
+    return build_graph().compile()
+
+
+def run_gate(graph, state: Dict[str, Any], config: Dict[str, Any], checkpointed: bool) -> Dict[str, Any]:
+    if checkpointed:
+        return run_checkpointed(graph, state, config)
+    return graph.invoke(state, config=config)
+
+
+# ---------- fleet mode ----------
+def read_repo_list(path: str) -> list[tuple[str, str | None]]:
+    """One repo per line, optionally followed by a base branch; '#' starts a comment."""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if parts:
+                out.append((normalize_repo(parts[0]), parts[1] if len(parts) > 1 else None))
+    return out
+
+
+def run_fleet(args, config: Dict[str, Any]) -> int:
+    queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+
+    if args.enqueue:
+        jobs = [(repo, base or args.base_branch, args.blocker_labels) for repo, base in read_repo_list(args.enqueue)]
+        print(f"[fleet] enqueued {queue.enqueue(jobs)} job(s) into {args.queue}")
+
+    if args.worker:
+        graph = compile_graph(args.checkpoint_db)
+
+        def gate(job):
+            state = default_state(repo=job["repo"], base_branch=job["base_branch"], blocker_labels=job["blocker_labels"])
+            t0 = time.time()
+            final = run_gate(graph, state, config, bool(args.checkpoint_db))
+            return result_subset(final, time.time() - t0)
+
+        shared = get_shared_cache()
+        stats = run_worker(queue, gate, counters_fn=shared.counters if shared else None)
+        print(f"[fleet] worker finished: {stats['done']} done, {stats['failed']} failed, {stats['lost']} lost lease")
+
+    if args.progress:
+        print(json.dumps(queue.progress(), indent=2))
+    return 0
+
+
 def main():
     load_dotenv()  # GEMINI_API_KEY, GITHUB_TOKEN, etc.
     ap = argparse.ArgumentParser(description="Release Gatekeeper (LangGraph + Gemini)")
-    ap.add_argument("--repo", required=True, help="GitHub repo as URL or owner/name")
+    ap.add_argument("--repo", help="GitHub repo as URL or owner/name (required unless --queue)")
     ap.add_argument("--base-branch", default="main", help="Target branch (default: main)")
     ap.add_argument(
         "--blocker-labels", default="release-blocker,P1",
@@ -149,19 +254,120 @@ def main():
     )
     ap.add_argument(
         "--model", default="gemini-1.5-flash-002",
-        help="Gemini model for judge (e.g., gemini-1.5-pro-002)"
+        help="Gemini model for judge (e.g., gemini-1.5-pro-002); first tier when --escalate-model is set"
+    )
+    ap.add_argument(
+        "--escalate-model", metavar="MODEL",
+        help="Stronger model to escalate to on low confidence, PAUSE, or evidence violations (e.g., gemini-1.5-pro-002)"
+    )
+    ap.add_argument(
+        "--min-confidence", type=float, default=0.8,
+        help="With --escalate-model, accept the first tier only at or above this confidence (default: 0.8)"
+    )
+    ap.add_argument(
+        "--stream-judge", action="store_true",
+        help="Stream the judge's JSON and verify evidence as it arrives; abort on the first bad citation"
+    )
+    ap.add_argument(
+        "--no-reask", action="store_true",
+        help="With --stream-judge, don't re-ask once after an aborted answer"
+    )
+    ap.add_argument(
+        "--failure-logs", action="store_true",
+        help="On NO_GO, stream failed Actions job logs and attach their top error lines"
+    )
+    ap.add_argument(
+        "--log-max-bytes", type=int, default=64 * 1024 * 1024,
+        help="Total log bytes to scan across all failed jobs (default: 64 MiB)"
+    )
+    ap.add_argument(
+        "--log-concurrency", type=int, default=4,
+        help="Failed job logs downloaded in parallel (default: 4)"
+    )
+    ap.add_argument(
+        "--checkpoint-db", metavar="PATH",
+        help="SQLite checkpoint store; re-runs for the same head SHA resume instead of re-judging. "
+             "Uses SQLite WAL: keep it on local disk (with --worker, one per host, not on the shared FS)"
+    )
+    tape = ap.add_mutually_exclusive_group()
+    tape.add_argument(
+        "--record", metavar="FILE",
+        help="Record every GitHub/Gemini exchange into a cassette (.json or .json.gz)"
+    )
+    tape.add_argument(
+        "--replay", metavar="FILE",
+        help="Replay a recorded cassette instead of calling GitHub/Gemini"
+    )
+    ap.add_argument(
+        "--replay-latency", action="store_true",
+        help="With --replay, sleep for each exchange's recorded latency"
+    )
+    fleet = ap.add_argument_group("fleet mode")
+    fleet.add_argument("--queue", metavar="PATH", help="SQLite work queue / result store shared by workers")
+    fleet.add_argument("--enqueue", metavar="FILE", help="Add repos from FILE ('owner/name [base-branch]' per line)")
+    fleet.add_argument("--worker", action="store_true", help="Process queued jobs until the queue is drained")
+    fleet.add_argument("--progress", action="store_true", help="Print queue progress/throughput as JSON")
+    fleet.add_argument("--lease-seconds", type=float, default=900.0, help="Job lease before another worker may retry it")
+    fleet.add_argument(
+        "--shared-cache", metavar="PATH",
+        help="SQLite HTTP/judge cache + rate-limit accounting shared across processes "
+             "(default with --worker: <queue>.cache.sqlite)"
     )
     args = ap.parse_args()
+    if not args.queue and not args.repo:
+        ap.error("--repo is required unless --queue is given")
+    if args.queue and not (args.enqueue or args.worker or args.progress):
+        ap.error("--queue needs at least one of --enqueue, --worker, --progress")
+
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, mode="record")
+    elif args.replay:
+        cassette = Cassette(args.replay, mode="replay", simulate_latency=args.replay_latency)
+    set_cassette(cassette)
+
+    shared_path = args.shared_cache
+    if shared_path is None and args.queue and args.worker:
+        shared_path = os.path.splitext(args.queue)[0] + ".cache.sqlite"
+    if shared_path:
+        set_shared_cache(SharedCache(shared_path))
+    if args.queue and args.worker:
+        # Workers share one issue index next to the queue instead of one per CWD
+        set_index_root(os.path.splitext(args.queue)[0] + ".cache")
+
+    config = {"configurable": {
+        "model": args.model,
+        "escalate_model": args.escalate_model,
+        "min_confidence": args.min_confidence,
+        "stream_judge": args.stream_judge,
+        "stream_reask": not args.no_reask,
+        "failure_logs": args.failure_logs,
+        "log_max_bytes": args.log_max_bytes,
+        "log_concurrency": args.log_concurrency,
+    }}
+
+    if args.queue:
+        try:
+            code = run_fleet(args, config)
+        finally:
+            if cassette is not None:
+                cassette.save()
+        sys.exit(code)
 
     repo = normalize_repo(args.repo)
 
     # build graph & run
     state = default_state(repo=repo, base_branch=args.base_branch, blocker_labels=args.blocker_labels)
-    graph = build_graph().compile()
 
     t0 = time.time()
     ## Runable Program
-    final = graph.invoke(state, config={"configurable": {"model": args.model}})
+    try:
+        graph = compile_graph(args.checkpoint_db)
+        final = run_gate(graph, state, config, bool(args.checkpoint_db))
+    finally:
+        # Keep whatever was captured, even if the run itself blew up
+        if cassette is not None:
+            cassette.save()
     dt = time.time() - t0
 
     # render
@@ -170,21 +376,7 @@ def main():
     elif args.format == "md":
         out = render_md(final)
     else:
-        # minimal stable JSON subset
-        subset = {
-            "repo": final.get("repo"),
-            "decision": final.get("decision"),
-            "confidence": final.get("confidence"),
-            "reasons": final.get("reasons", []),
-            "evidence": final.get("evidence", []),
-            "policy_violations": final.get("policy_violations", []),
-            "pr": final.get("pr"),
-            "latest_run": final.get("actions", {}).get("latest_run"),
-            "checks_count": len(final.get("checks", {}).get("runs", [])),
-            "blockers_count": len(final.get("blockers", [])),
-            "elapsed_sec": round(dt, 2),
-        }
-        out = json.dumps(subset, ensure_ascii=False, indent=2)
+        out = json.dumps(result_subset(final, dt), ensure_ascii=False, indent=2)
 
     print(out)
     print(f"\n(Elapsed: {dt:.2f}s)")
@@ -0,0 +1,76 @@
+# tests/test_cassette.py
+import json
+
+import pytest
+import requests
+
+import gatekeeper.judge as judge
+import tools.github_tools as gt
+from utils.cassette import Cassette, CassetteMiss, set_cassette
+
+
+def _response(status, body, headers=None, url="https://api.github.com/x"):
+    r = requests.Response()
+    r.status_code, r._content, r.url = status, json.dumps(body).encode(), url
+    r.headers.update(headers or {"Content-Type": "application/json", "ETag": '"abc"'})
+    return r
+
+
+@pytest.fixture(autouse=True)
+def _no_cassette():
+    yield
+    set_cassette(None)
+
+
+def _run_all():
+    head = gt.get_branch_head_sha("o/r", branch="main")
+    try:
+        gt.get_default_branch("o/missing")
+        missing = None
+    except requests.HTTPError as e:
+        missing = e.response.status_code
+    decision = judge.llm_decide({"repo": "o/r"}, model="m")
+    return head, missing, decision
+
+
+@pytest.mark.parametrize("name", ["tape.json", "tape.json.gz"])
+def test_record_then_replay_returns_identical_results(tmp_path, monkeypatch, name):
+    path = str(tmp_path / name)
+    answers = {
+        "/repos/o/r/branches/main": _response(200, {"commit": {"sha": "abc123", "html_url": "h"}}),
+        "/repos/o/missing": _response(404, {"message": "Not Found"}),
+    }
+    monkeypatch.setattr(gt, "_send", lambda m, url, p, *a, **k: answers[url[len(gt.GH):]])
+    monkeypatch.setattr(judge, "_llm_decide", lambda s, m, t: {"decision": "GO", "confidence": 0.9, "evidence": []})
+
+    cassette = Cassette(path, mode="record")
+    set_cassette(cassette)
+    recorded = _run_all()
+    cassette.save()
+
+    # Replay must never touch the network or the model
+    def boom(*a, **k):
+        raise AssertionError("live call during replay")
+    monkeypatch.setattr(gt, "_send", boom)
+    monkeypatch.setattr(judge, "_llm_decide", boom)
+    set_cassette(Cassette(path, mode="replay"))
+    assert _run_all() == recorded
+    assert recorded[0]["sha"] == "abc123" and recorded[1] == 404
+
+
+def test_replay_miss_raises(tmp_path):
+    path = str(tmp_path / "empty.json")
+    Cassette(path, mode="record").save()
+    set_cassette(Cassette(path, mode="replay"))
+    with pytest.raises(CassetteMiss):
+        gt.get_branch_head_sha("o/r")
+
+
+def test_repeated_requests_replay_in_order(tmp_path):
+    path = str(tmp_path / "fifo.json")
+    rec = Cassette(path, mode="record")
+    for i in range(3):
+        rec.exchange("k", {"same": True}, lambda i=i: i)
+    rec.save()
+    rep = Cassette(path, mode="replay")
+    assert [rep.exchange("k", {"same": True}, lambda: None) for _ in range(3)] == [0, 1, 2]
@@ -0,0 +1,123 @@
+# tests/test_checkpoint.py
+from types import SimpleNamespace
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+import gatekeeper.graph as graph_mod
+from gatekeeper.checkpoint import run_checkpointed, thread_id_for
+from gatekeeper.state import default_state
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Real graph on an in-memory checkpointer; GitHub and the judge are stubbed and counted."""
+    calls = {"signals": 0, "judge": 0}
+    run = {"status": "completed", "conclusion": "success", "url": "u"}
+    judge = {"decision": "GO", "confidence": 0.9, "reasons": ["ok"], "evidence": [], "policy_violations": []}
+    outcome = {"verified": True, "violations": []}
+    blockers = []
+
+    def latest_run(repo, sha):
+        calls["signals"] += 1
+        return dict(run)
+
+    def cascade(signals, models, **kw):
+        calls["judge"] += 1
+        if outcome.get("crash"):
+            raise RuntimeError(outcome.pop("crash"))
+        return {"judge": dict(judge), **outcome, "tier": 0, "model": models[0], "escalations": []}
+
+    monkeypatch.setattr(graph_mod, "get_branch_head_sha", lambda repo, branch: {"sha": "abc"})
+    monkeypatch.setattr(graph_mod, "get_open_pr", lambda *a, **k: None)
+    monkeypatch.setattr(graph_mod, "get_latest_run_for_sha", latest_run)
+    monkeypatch.setattr(graph_mod, "get_check_runs", lambda repo, sha: [])
+    monkeypatch.setattr(graph_mod, "get_blockers", lambda repo, labels_csv: list(blockers))
+    monkeypatch.setattr(graph_mod, "judge_cascade", cascade)
+    monkeypatch.setattr(graph_mod, "make_summary_md", lambda state, model: "summary")
+
+    compiled = graph_mod.build_graph().compile(checkpointer=MemorySaver())
+
+    def go(**configurable):
+        return run_checkpointed(compiled, default_state("o/r"), {"configurable": {"model": "m", **configurable}})
+
+    return SimpleNamespace(go=go, calls=calls, run=run, judge=judge, outcome=outcome, blockers=blockers)
+
+
+def test_unchanged_signals_reuse_the_verdict(gate):
+    assert gate.go()["decision"] == "GO"
+    assert gate.go()["decision"] == "GO"
+    # Signals are always refetched; the judge is not asked again
+    assert gate.calls == {"signals": 2, "judge": 1}
+
+
+def test_blocker_filed_after_go_is_not_stale(gate):
+    assert gate.go()["decision"] == "GO"
+    gate.blockers.append({"title": "ship-stopper", "labels": ["release-blocker"], "url": "u"})
+    final = gate.go()
+    assert final["decision"] == "NO_GO"
+    assert final["reasons"] == ["Open blocker issues present: 1"]
+
+
+def test_in_progress_run_is_refetched(gate):
+    gate.run.update(status="in_progress", conclusion=None)
+    assert gate.go()["decision"] == "NO_GO"
+    gate.run.update(status="completed", conclusion="success")
+    final = gate.go()
+    assert final["decision"] == "GO"
+    # Stale reasons from the first pass don't leak into the re-run
+    assert final["reasons"] == ["ok"]
+    gate.go()
+    assert gate.calls == {"signals": 3, "judge": 1}
+
+
+def test_failed_evidence_check_is_rejudged(gate):
+    gate.outcome.update(verified=False, violations=["evidence[0]: value mismatch"])
+    assert gate.go()["decision"] == "PAUSE"
+    gate.outcome.update(verified=True, violations=[])
+    assert gate.go()["decision"] == "GO"
+    assert gate.calls["judge"] == 2
+
+
+def test_streaming_evidence_violation_is_rejudged(gate):
+    gate.judge.update(decision="PAUSE", policy_violations=["EVIDENCE_VIOLATION: evidence[0]: not found"])
+    assert gate.go()["decision"] == "PAUSE"
+    gate.judge.update(decision="GO", policy_violations=[])
+    assert gate.go()["decision"] == "GO"
+    assert gate.calls["judge"] == 2
+
+
+def test_interrupted_run_resumes_after_fetch(gate):
+    gate.outcome["crash"] = "judge died"
+    with pytest.raises(RuntimeError):
+        gate.go()
+    final = gate.go()
+    assert final["decision"] == "GO" and final["reasons"] == ["ok"]
+    # Signals refetched once to confirm nothing changed, then resumed at the judge
+    assert gate.calls == {"signals": 2, "judge": 2}
+
+
+def test_structured_output_error_is_rejudged(gate):
+    go, calls, judge = gate.go, gate.calls, gate.judge
+    judge.update(decision="PAUSE", policy_violations=["STRUCTURED_OUTPUT_ERROR"])
+    assert go()["decision"] == "PAUSE"
+    judge.update(decision="GO", policy_violations=[])
+    final = go()
+    assert final["decision"] == "GO" and final["policy_violations"] == []
+    assert calls["judge"] == 2
+
+
+def test_judge_config_gets_its_own_thread(gate):
+    go, calls = gate.go, gate.calls
+    go()
+    go(escalate_model="big")
+    go(stream_judge=True)
+    go(failure_logs=True)
+    assert calls["judge"] == 4
+
+
+def test_thread_id_depends_on_judge_config():
+    base = thread_id_for("o/r", "main", "abc", "P1", {"model": "a"})
+    assert base == thread_id_for("o/r", "main", "abc", "P1", {"model": "a", "thread_id": "x", "log_max_bytes": 1})
+    assert base != thread_id_for("o/r", "main", "abc", "P1", {"model": "b"})
+    assert base != thread_id_for("o/r", "main", "abc", "P1", {"model": "a", "failure_logs": True})
@@ -0,0 +1,96 @@
+# tests/test_evidence_scanner.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import gatekeeper.judge as judge
+from gatekeeper.judge import _EvidenceScanner
+from utils.shared_cache import SharedCache, set_shared_cache
+
+SIGNALS = {"actions": {"latest_run": {"conclusion": "success"}}, "checks": {"runs": []}, "blockers": []}
+GOOD = {"source": "actions", "path": "actions.latest_run.conclusion", "value": "success"}
+BAD = {"source": "actions", "path": "actions.latest_run.conclusion", "value": "failure"}
+
+
+def _answer(*evidence, decision="GO"):
+    return json.dumps({"decision": decision, "confidence": 0.9, "reasons": ["r"],
+                       "evidence": list(evidence), "policy_violations": []})
+
+
+def _scan(text, size):
+    scanner = _EvidenceScanner()
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(scanner.feed(text[i:i + size]))
+    return out
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 10_000])
+def test_items_survive_any_chunking(size):
+    tricky = {"source": "checks", "path": "checks.runs.0.name", "value": 'a "}{" ] [ \\" brace',
+              "meta": {"nested": [1, {"x": "}"}]}}
+    text = ('{"reasons": ["evidence", "{[}"], "decision": "evidence", '
+            f'"evidence": [{json.dumps(GOOD)}, {json.dumps(tricky)}], "after": {{"evidence": [{{"no": 1}}]}}}}')
+    assert _scan(text, size) == [(0, GOOD), (1, tricky)]
+
+
+def test_item_is_yielded_before_the_answer_ends():
+    scanner = _EvidenceScanner()
+    assert list(scanner.feed('{"evidence": [' + json.dumps(GOOD))) == [(0, GOOD)]
+    assert list(scanner.feed(', {"source"')) == []
+
+
+class FakeLLM:
+    """Streams canned answers (one per call) in small chunks; records messages and closes."""
+    answers, calls, closed = [], [], []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def stream(self, messages):
+        FakeLLM.calls.append(messages)
+        text = FakeLLM.answers[len(FakeLLM.calls) - 1]
+
+        def gen():
+            try:
+                for i in range(0, len(text), 5):
+                    yield SimpleNamespace(content=text[i:i + 5])
+            finally:
+                FakeLLM.closed.append(len(FakeLLM.calls))
+        return gen()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    FakeLLM.answers, FakeLLM.calls, FakeLLM.closed = [], [], []
+    monkeypatch.setattr(judge, "ChatGoogleGenerativeAI", FakeLLM)
+    yield FakeLLM
+    set_shared_cache(None)
+
+
+def test_bad_evidence_aborts_and_reask_recovers(fake_llm):
+    fake_llm.answers = [_answer(BAD, GOOD) + " " * 500, _answer(GOOD)]
+    out = judge._llm_decide_stream(SIGNALS, "m", 0.1, reask=True)
+    assert out["decision"] == "GO" and out["evidence"] == [GOOD]
+    assert len(fake_llm.calls) == 2 and fake_llm.closed == [1, 2]
+    # The re-ask carries the partial answer and the violation
+    assert "value mismatch" in fake_llm.calls[1][-1].content
+
+
+def test_repeated_violation_is_listed_once(fake_llm):
+    fake_llm.answers = [_answer(BAD), _answer(BAD)]
+    out = judge._llm_decide_stream(SIGNALS, "m", 0.1, reask=True)
+    assert out["decision"] == "PAUSE"
+    assert len(out["policy_violations"]) == 1
+    assert out["policy_violations"][0].startswith("EVIDENCE_VIOLATION: evidence[0]: value mismatch")
+
+
+def test_evidence_violations_are_not_cached(fake_llm, tmp_path):
+    set_shared_cache(SharedCache(str(tmp_path / "cache.sqlite")))
+    fake_llm.answers = [_answer(BAD), _answer(BAD), _answer(GOOD)]
+    assert judge.llm_decide(SIGNALS, model="m", stream=True)["decision"] == "PAUSE"
+    assert judge.llm_decide(SIGNALS, model="m", stream=True)["decision"] == "GO"
+    # A verified answer is cached: no further model call
+    assert judge.llm_decide(SIGNALS, model="m", stream=True)["decision"] == "GO"
+    assert len(fake_llm.calls) == 3
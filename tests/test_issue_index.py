@@ -0,0 +1,104 @@
+# tests/test_issue_index.py
+import json
+
+import pytest
+
+import tools.github_tools as gt
+from tools.issue_index import IssueIndex
+from utils.cassette import RecordedResponse
+
+
+def _issue(number, labels, state="open"):
+    return {"number": number, "title": f"#{number}", "state": state,
+            "html_url": f"https://github.com/o/r/issues/{number}", "labels": [{"name": l} for l in labels]}
+
+
+@pytest.fixture
+def github(tmp_path, monkeypatch):
+    """Fake /issues endpoint that honours state, labels (single) and since; logs every request."""
+    monkeypatch.setenv("GATEKEEPER_CACHE_DIR", str(tmp_path))
+    issues, calls = {}, []
+    dates = (f"Mon, {d:02d} Jan 2024 00:00:00 GMT" for d in range(1, 32))
+
+    def send(method, url, params, *a, **k):
+        calls.append(dict(params or {}))
+        rows = list(issues.values())
+        if params.get("state") == "open":
+            rows = [it for it in rows if it["state"] == "open"]
+        if "labels" in params:
+            rows = [it for it in rows if params["labels"] in [l["name"] for l in it["labels"]]]
+        return RecordedResponse(200, {"Date": next(dates)}, json.dumps(rows).encode(), url)
+
+    monkeypatch.setattr(gt, "_send", send)
+    return issues, calls
+
+
+def test_first_sync_is_label_filtered(github):
+    issues, calls = github
+    issues.update({1: _issue(1, ["P1"]), 2: _issue(2, ["docs"]), 3: _issue(3, ["release-blocker", "P1"])})
+    found = gt.get_blockers("o/r", "release-blocker,P1")
+    assert [it["title"] for it in found] == ["#3", "#1"]
+    assert calls == [{"state": "open", "labels": "release-blocker", "per_page": 100},
+                     {"state": "open", "labels": "P1", "per_page": 100}]
+    # Nothing outside the requested labels is stored
+    assert set(IssueIndex.load("o/r").issues) == {"1", "3"}
+
+
+def test_later_syncs_are_incremental(github):
+    issues, calls = github
+    issues.update({1: _issue(1, ["P1"]), 2: _issue(2, ["P1"])})
+    gt.get_blockers("o/r", "P1")
+    issues[1] = _issue(1, ["P1"], state="closed")
+    issues[2] = _issue(2, ["docs"])
+    issues[4] = _issue(4, ["p1"])
+    assert [it["title"] for it in gt.get_blockers("o/r", "P1")] == ["#4"]
+    assert calls[-1]["state"] == "all" and "since" in calls[-1] and "labels" not in calls[-1]
+
+
+def test_new_label_is_bootstrapped_once(github):
+    issues, calls = github
+    issues.update({1: _issue(1, ["P1"]), 2: _issue(2, ["urgent"])})
+    gt.get_blockers("o/r", "P1")
+    assert [it["title"] for it in gt.get_blockers("o/r", "P1,urgent")] == ["#2", "#1"]
+    assert [c.get("labels") for c in calls] == ["P1", None, "urgent"]
+    gt.get_blockers("o/r", "urgent")
+    assert [c.get("labels") for c in calls[3:]] == [None]
+
+
+def test_index_root_precedence(tmp_path, monkeypatch):
+    from tools.issue_index import index_dir, set_index_root
+
+    monkeypatch.delenv("GATEKEEPER_CACHE_DIR", raising=False)
+    try:
+        set_index_root(str(tmp_path / "fleet.cache"))
+        assert index_dir() == str(tmp_path / "fleet.cache" / "issues")
+        monkeypatch.setenv("GATEKEEPER_CACHE_DIR", str(tmp_path / "env"))
+        assert index_dir() == str(tmp_path / "env" / "issues")
+    finally:
+        set_index_root(None)
+    monkeypatch.delenv("GATEKEEPER_CACHE_DIR")
+    assert index_dir() == ".gatekeeper/issues"
+
+
+
+def test_not_modified_response_carries_the_live_date(tmp_path, monkeypatch):
+    from utils.shared_cache import SharedCache, set_shared_cache
+
+    dates = iter(["Mon, 01 Jan 2024 00:00:00 GMT", "Tue, 02 Jan 2024 00:00:00 GMT"])
+    body = json.dumps([_issue(1, ["P1"])]).encode()
+
+    def send(method, url, params, extra_headers=None, *a, **k):
+        status = 304 if extra_headers and "If-None-Match" in extra_headers else 200
+        return RecordedResponse(status, {"Date": next(dates), "ETag": '"e"'}, body if status == 200 else b"", url)
+
+    monkeypatch.setattr(gt, "_send", send)
+    set_shared_cache(SharedCache(str(tmp_path / "cache.sqlite")))
+    try:
+        url, params = f"{gt.GH}/repos/o/r/issues", {"state": "all", "since": "2023-12-31T00:00:00Z"}
+        gt._fetch("GET", url, params)
+        again = gt._fetch("GET", url, params)
+        # Served from the cache, but a sync stamped from it must not move back to the first fetch
+        assert again.content == body
+        assert gt._server_time(again) == "2024-01-02T00:00:00Z"
+    finally:
+        set_shared_cache(None)
@@ -0,0 +1,102 @@
+# tests/test_job_logs.py
+import json
+
+import pytest
+
+import tools.github_tools as gt
+from utils.cassette import Cassette, RecordedResponse, set_cassette
+
+
+class CountingResponse(RecordedResponse):
+    """Counts the chunks handed out, to prove nothing is read past the stopping point."""
+    served = 0
+
+    def iter_content(self, chunk_size=65536):
+        for chunk in super().iter_content(chunk_size):
+            CountingResponse.served += 1
+            yield chunk
+
+
+@pytest.fixture
+def log_body(monkeypatch):
+    """Serve `body[0]` (with `headers`) as every job log; counts requests."""
+    body, calls, headers = [b""], [], {}
+    CountingResponse.served = 0
+
+    def send(method, url, params, *a, **k):
+        calls.append(url)
+        return CountingResponse(200, dict(headers), body[0], url)
+
+    monkeypatch.setattr(gt, "_send", send)
+    yield body, calls, headers
+    set_cassette(None)
+
+
+def test_annotations_first_and_fully_read_log_is_not_truncated(log_body):
+    body, _, headers = log_body
+    body[0] = b"2024-01-01T00:00:00.000Z step\nnpm ERR! failed\n##[error]Process completed with exit code 1.\n"
+    headers["Content-Length"] = str(len(body[0]))
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=1 << 20, max_lines=1, chunk_size=8)
+    assert out == {"lines": ["Process completed with exit code 1."], "bytes": len(body[0]), "truncated": False}
+
+
+def test_early_stop_reads_nothing_more_and_reports_unknown(log_body):
+    body, _, _ = log_body
+    body[0] = b"##[error]first\n" + b"ok\n" * 100
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=1 << 20, max_lines=1, chunk_size=16)
+    assert out == {"lines": ["first"], "bytes": 16, "truncated": None}
+    assert CountingResponse.served == 1
+
+
+@pytest.mark.parametrize("extra, truncated", [(b"ok\n" * 100, True), (b"", False)])
+def test_early_stop_uses_content_length(log_body, extra, truncated):
+    body, _, headers = log_body
+    body[0] = b"##[error]first\n" + extra
+    headers["Content-Length"] = str(len(body[0]))
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=1 << 20, max_lines=1, chunk_size=15)
+    assert out["truncated"] is truncated and out["bytes"] == 15
+    assert CountingResponse.served == 1
+
+
+def test_budget_stop_never_reads_past_the_budget(log_body):
+    body, _, _ = log_body
+    body[0] = b"ok\n" * 100
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=32, chunk_size=16)
+    assert out["bytes"] == 32 and out["truncated"] is None
+    assert CountingResponse.served == 2
+
+
+def test_budget_cut_scans_the_partial_last_line(log_body):
+    body, _, _ = log_body
+    body[0] = b"ok\nfatal: repository not found and more text\n"
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=20, chunk_size=64)
+    assert out == {"lines": ["fatal: repository"], "bytes": 20, "truncated": True}
+
+
+def test_overlong_line_keeps_its_start(log_body):
+    body, _, _ = log_body
+    body[0] = b"error: " + b"x" * (gt.MAX_LOG_LINE * 3) + b"\n"
+    out = gt.get_job_log_errors("o/r", 1, max_bytes=1 << 20, chunk_size=1000)
+    assert out["lines"] == [("error: " + "x" * 293)] and out["truncated"] is False
+
+
+def test_http_error_becomes_error_field(monkeypatch):
+    monkeypatch.setattr(gt, "_send", lambda *a, **k: RecordedResponse(410, {}, b"gone"))
+    assert gt.get_job_log_errors("o/r", 1, max_bytes=100)["error"] == "HTTP 410"
+
+
+def test_cassette_records_result_not_log_body(tmp_path, log_body):
+    body, calls, _ = log_body
+    body[0] = b"SECRET-BODY " * 1000 + b"\n##[error]boom\n"
+    path = str(tmp_path / "tape.json")
+    cassette = Cassette(path, mode="record")
+    set_cassette(cassette)
+    recorded = gt.get_job_log_errors("o/r", 7, max_bytes=1 << 20)
+    cassette.save()
+    with open(path, encoding="utf-8") as f:
+        stored = f.read()
+    assert "SECRET-BODY" not in stored and json.loads(stored)["interactions"][0]["kind"] == "job_log_errors"
+
+    set_cassette(Cassette(path, mode="replay"))
+    assert gt.get_job_log_errors("o/r", 7, max_bytes=1 << 20) == recorded
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+# tests/test_judge_cascade.py
+import pytest
+
+import gatekeeper.judge as judge
+from gatekeeper.graph import node_llm_judge
+from gatekeeper.state import default_state
+
+SIGNALS = {"actions": {"latest_run": {"conclusion": "success"}}, "checks": {"runs": []}, "blockers": []}
+GOOD = {"source": "actions", "path": "actions.latest_run.conclusion", "value": "success"}
+BAD = {"source": "actions", "path": "actions.latest_run.conclusion", "value": "failure"}
+
+
+def _answer(decision="GO", confidence=0.9, evidence=(GOOD,)):
+    return {"decision": decision, "confidence": confidence, "reasons": [decision],
+            "evidence": list(evidence), "policy_violations": []}
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Stub llm_decide: per-model canned answers; records the models asked, in order."""
+    by_model, asked = {}, []
+
+    def llm_decide(signals, model, temperature=0.1, stream=False, reask=True):
+        asked.append(model)
+        return by_model[model]
+
+    monkeypatch.setattr(judge, "llm_decide", llm_decide)
+    return by_model, asked
+
+
+def test_confident_verified_answer_is_accepted_at_tier_0(answers):
+    by_model, asked = answers
+    by_model.update(cheap=_answer(), big=_answer("NO_GO"))
+    out = judge.judge_cascade(SIGNALS, ["cheap", "big"])
+    assert asked == ["cheap"]
+    assert (out["tier"], out["model"], out["escalations"], out["verified"]) == (0, "cheap", [], True)
+    assert out["judge"]["decision"] == "GO"
+
+
+@pytest.mark.parametrize("cheap, why", [
+    (_answer(confidence=0.5), "confidence 0.50 < 0.80"),
+    (_answer("PAUSE"), "PAUSE"),
+    (_answer(evidence=(BAD,)), "1 evidence violation(s)"),
+])
+def test_escalates_on_low_confidence_pause_or_bad_evidence(answers, cheap, why):
+    by_model, asked = answers
+    by_model.update(cheap=cheap, big=_answer("NO_GO"))
+    out = judge.judge_cascade(SIGNALS, ["cheap", "big"])
+    assert asked == ["cheap", "big"]
+    assert (out["tier"], out["model"]) == (1, "big")
+    assert out["escalations"] == [f"cheap: {why}"]
+    assert out["judge"]["decision"] == "NO_GO"
+
+
+def test_last_tier_is_final_whatever_it_says(answers):
+    by_model, asked = answers
+    by_model.update(cheap=_answer("PAUSE", 0.2), big=_answer(confidence=0.1, evidence=(BAD,)))
+    out = judge.judge_cascade(SIGNALS, ["cheap", "big"])
+    assert asked == ["cheap", "big"]
+    assert (out["tier"], out["model"], out["verified"]) == (1, "big", False)
+    assert out["escalations"] == ["cheap: PAUSE, confidence 0.20 < 0.80"]
+    assert len(out["violations"]) == 1
+
+
+def _judge_node(escalate_model=None):
+    state = default_state("o/r")
+    state.update(head_sha="abc", awaiting_llm=True, actions={"latest_run": SIGNALS["actions"]["latest_run"]})
+    config = {"configurable": {"model": "cheap", "escalate_model": escalate_model}}
+    return node_llm_judge(state, config)
+
+
+def test_escalate_model_equal_to_model_is_asked_once(answers):
+    by_model, asked = answers
+    by_model.update(cheap=_answer("PAUSE"))
+    state = _judge_node(escalate_model="cheap")
+    assert asked == ["cheap"]
+    assert state["judge"] == {"tier": 0, "model": "cheap", "escalations": [], "verified": True}
+
+
+def test_state_records_tier_model_and_escalations(answers):
+    by_model, asked = answers
+    by_model.update(cheap=_answer(confidence=0.3), big=_answer())
+    state = _judge_node(escalate_model="big")
+    assert state["decision"] == "GO" and state["confidence"] == 0.9
+    assert state["judge"] == {"tier": 1, "model": "big", "escalations": ["cheap: confidence 0.30 < 0.80"],
+                              "verified": True}
+
+
+def test_unverified_final_answer_pauses_the_gate(answers):
+    by_model, _ = answers
+    by_model.update(cheap=_answer(evidence=(BAD,)))
+    state = _judge_node()
+    assert state["decision"] == "PAUSE" and state["judge"]["verified"] is False
+    assert state["reasons"] == ["Evidence verification failed."]
@@ -0,0 +1,164 @@
+# tests/test_work_queue.py
+import sqlite3
+import time
+
+import pytest
+
+from gatekeeper.fleet import run_worker
+from utils.work_queue import WorkQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for lease/backoff tests."""
+    now = [1000.0]
+    monkeypatch.setattr("utils.work_queue.time.time", lambda: now[0])
+    return now
+
+
+def _queue(tmp_path, **kw):
+    q = WorkQueue(str(tmp_path / "q.sqlite"), lease_seconds=60, **kw)
+    q.enqueue([("o/a", "main", "P1"), ("o/b", "main", "P1")])
+    return q
+
+
+def test_claims_are_exclusive_and_ordered(tmp_path, clock):
+    q = _queue(tmp_path)
+    other = WorkQueue(q.path)
+    a, b = q.claim("w1"), other.claim("w2")
+    assert (a["repo"], b["repo"]) == ("o/a", "o/b")
+    assert q.claim("w3") is None
+
+
+def test_expired_lease_is_reclaimed_and_old_holder_is_fenced(tmp_path, clock):
+    q = _queue(tmp_path)
+    job = q.claim("w1")
+    q.claim("w1")
+    clock[0] += 61
+    again = q.claim("w2")
+    assert again["id"] == job["id"] and again["attempts"] == 2
+    # w1 lost the lease: its late result/failure must not overwrite w2's run
+    assert q.complete(job["id"], "w1", {"decision": "GO"}) is False
+    assert q.fail(job["id"], "w1", "boom") is False
+    assert q.complete(job["id"], "w2", {"decision": "NO_GO"}) is True
+    assert q.results()[0]["result"] == {"decision": "NO_GO"}
+
+
+def test_fail_backs_off_exponentially_then_gives_up(tmp_path, clock):
+    q = WorkQueue(str(tmp_path / "q.sqlite"), lease_seconds=60, max_attempts=3, retry_backoff=10)
+    q.enqueue([("o/a", "main", "P1")])
+    for delay in (10, 20):
+        job = q.claim("w")
+        assert q.fail(job["id"], "w", "boom")
+        clock[0] += delay - 1
+        assert q.claim("w") is None
+        clock[0] += 1
+    job = q.claim("w")
+    assert job["attempts"] == 3
+    q.fail(job["id"], "w", "boom")
+    assert q.results()[0]["status"] == "failed"
+    clock[0] += 1000
+    assert q.claim("w") is None
+
+
+def test_expired_lease_on_last_attempt_is_failed(tmp_path, clock):
+    q = WorkQueue(str(tmp_path / "q.sqlite"), lease_seconds=60, max_attempts=1)
+    q.enqueue([("o/a", "main", "P1")])
+    q.claim("w1")
+    clock[0] += 61
+    assert q.claim("w2") is None
+    assert q.results()[0]["error"] == "lease expired"
+
+
+def test_old_queue_files_are_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, repo TEXT NOT NULL, base_branch TEXT NOT NULL, "
+        "blocker_labels TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+        "worker TEXT, lease_until REAL, enqueued_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+        "result TEXT, error TEXT)"
+    )
+    conn.execute("INSERT INTO jobs (repo, base_branch, blocker_labels, enqueued_at) VALUES ('o/a', 'main', '', 0)")
+    conn.commit()
+    conn.close()
+    assert WorkQueue(path).claim("w")["repo"] == "o/a"
+
+
+@pytest.fixture
+def sleeps(clock, monkeypatch):
+    """time.sleep that advances the controlled clock instead of blocking."""
+    slept = []
+
+    def sleep(sec):
+        slept.append(sec)
+        clock[0] += sec
+
+    monkeypatch.setattr("gatekeeper.fleet.time.sleep", sleep)
+    return slept
+
+
+def test_run_worker_waits_out_backoff_and_retries(tmp_path, sleeps):
+    q = WorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue([("o/a", "main", "")])
+    failures = ["flaky"]
+
+    def gate(job):
+        if failures:
+            raise RuntimeError(failures.pop())
+        return {"decision": "GO"}
+
+    stats = run_worker(q, gate, worker_id="w", log=lambda line: None)
+    assert stats == {"done": 1, "failed": 1, "lost": 0}
+    assert q.results()[0]["status"] == "done"
+    assert sum(sleeps) == pytest.approx(q.retry_backoff)
+
+
+def test_run_worker_picks_up_a_dead_workers_job(tmp_path, sleeps):
+    q = _queue(tmp_path)
+    q.claim("dead")
+    stats = run_worker(q, lambda job: {"decision": "GO"}, worker_id="w", log=lambda line: None)
+    assert stats["done"] == 2
+    assert [r["status"] for r in q.results()] == ["done", "done"]
+    # Polled no longer than the lease, in steps of at most poll_interval
+    assert sum(sleeps) == pytest.approx(60, abs=0.2) and max(sleeps) <= 30
+
+
+def test_run_worker_drains_queue(tmp_path, sleeps):
+    q = WorkQueue(str(tmp_path / "q.sqlite"))
+    q.enqueue([("o/a", "main", ""), ("o/bad", "main", ""), ("o/c", "main", "")])
+
+    def gate(job):
+        if job["repo"] == "o/bad":
+            raise RuntimeError("nope")
+        return {"decision": "GO"}
+
+    stats = run_worker(q, gate, worker_id="w", log=lambda line: None)
+    assert stats == {"done": 2, "failed": 3, "lost": 0}
+    assert [r["status"] for r in q.results()] == ["done", "failed", "done"]
+    assert q.next_ready() is None
+
+
+def test_renew_extends_only_the_holders_lease(tmp_path, clock):
+    q = _queue(tmp_path)
+    job = q.claim("w1")
+    clock[0] += 50
+    assert q.renew(job["id"], "w1") and not q.renew(job["id"], "w2")
+    clock[0] += 50
+    assert q.claim("w2")["id"] != job["id"]
+
+
+def test_lease_is_kept_through_a_slow_gate(tmp_path):
+    q = WorkQueue(str(tmp_path / "q.sqlite"), lease_seconds=0.3)
+    q.enqueue([("o/a", "main", "")])
+    thieves = []
+
+    def slow_gate(job):
+        if not thieves:
+            time.sleep(1.0)  # e.g. waiting out the shared GitHub quota
+            thieves.append(WorkQueue(q.path, lease_seconds=0.3).claim("thief"))
+        return {"decision": "GO"}
+
+    stats = run_worker(q, slow_gate, worker_id="w", log=lambda line: None)
+    assert thieves == [None]
+    assert stats == {"done": 1, "failed": 0, "lost": 0}
@@ -1,8 +1,19 @@
 # tools/github_tools.py
-import os, requests
+import os, re, requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    import ijson  # optional: streaming, field-projected parsing of large listings
+except ImportError:
+    ijson = None
+
+from utils.cassette import get_cassette, encode_response, decode_response, request_key
+from utils.shared_cache import get_shared_cache
+from tools.issue_index import IssueIndex
+
 GH = "https://api.github.com"
 BASE_HEADERS = {
     "Accept": "application/vnd.github+json",
@@ -11,26 +22,116 @@ BASE_HEADERS = {
 if os.getenv("GITHUB_TOKEN"):
     BASE_HEADERS["Authorization"] = f"Bearer {os.getenv('GITHUB_TOKEN')}"
 
-def _req(method, url, *, params=None):
+def _send(method, url, params, extra_headers=None, stream=False):
+    headers = {**BASE_HEADERS, **(extra_headers or {})}
     # First try with whatever headers we have
-    r = requests.request(method, url, params=params, headers=BASE_HEADERS, timeout=30)
-    if r.status_code == 401 and "Authorization" in BASE_HEADERS:
+    r = requests.request(method, url, params=params, headers=headers, timeout=30, stream=stream)
+    if r.status_code == 401 and "Authorization" in headers:
         # Retry once without Authorization header
-        hdrs = {k: v for k, v in BASE_HEADERS.items() if k != "Authorization"}
-        r2 = requests.request(method, url, params=params, headers=hdrs, timeout=30)
-        r2.raise_for_status()
-        return r2
-    r.raise_for_status()
+        r.close()
+        hdrs = {k: v for k, v in headers.items() if k != "Authorization"}
+        return requests.request(method, url, params=params, headers=hdrs, timeout=30, stream=stream)
+    return r
+
+def _fetch(method, url, params, stream=False, cache=True):
+    shared = get_shared_cache()
+    if shared is None or method != "GET":
+        return _send(method, url, params, stream=stream)
+    if not cache:
+        shared.wait_for_quota()
+        r = _send(method, url, params, stream=stream)
+        shared.incr("http_requests")
+        shared.note_rate_limit(r.headers)
+        return r
+
+    # Fleet mode: respect the shared quota and revalidate with ETags (304s are free)
+    shared.wait_for_quota()
+    key = request_key({"url": url, "params": params or {}})
+    cached = shared.get_http(key)
+    r = _send(method, url, params, {"If-None-Match": cached[0]} if cached else None, stream=stream)
+    shared.incr("http_requests")
+    shared.note_rate_limit(r.headers)
+    if r.status_code == 304 and cached:
+        shared.incr("http_not_modified")
+        r.close()
+        stored = cached[1]
+        # Callers stamp syncs with GitHub's clock, so hand back this response's Date, not the stored one
+        if r.headers.get("Date"):
+            stored.headers["Date"] = r.headers["Date"]
+        return stored
+    if r.status_code == 200 and r.headers.get("ETag"):
+        # Storing needs the whole body anyway; hand back the stored copy
+        return shared.put_http(key, r.headers["ETag"], r)
+    return r
+
+def _req(method, url, *, params=None, stream=False, cache=True):
+    """
+    GET/POST with 401 fallback. stream=True leaves the body unread so callers can
+    parse it incrementally via _project (cassettes and the shared cache still
+    read it whole, since they store it). cache=False keeps a response out of the
+    shared HTTP cache (e.g. multi-MB logs).
+    """
+    cassette = get_cassette()
+    if cassette is None:
+        r = _fetch(method, url, params, stream, cache)
+    else:
+        # Record/replay the final response (after any 401 retry), errors included
+        r = cassette.exchange(
+            "http", {"method": method, "url": url, "params": params or {}},
+            lambda: _fetch(method, url, params, stream, cache),
+            encode=encode_response, decode=decode_response, describe=True,
+        )
+    try:
+        r.raise_for_status()
+    except requests.HTTPError:
+        r.close()
+        raise
     return r
 
+def _pluck(obj, parts):
+    """Follow a dot path where 'item' fans out over a list."""
+    for i, part in enumerate(parts):
+        if part == "item":
+            return [_pluck(x, parts[i + 1:]) for x in (obj or [])]
+        obj = obj.get(part) if isinstance(obj, dict) else None
+    return obj
+
+def _project(r, prefix, fields):
+    """
+    Yield one flat dict per element at ijson `prefix` ("item" for a top-level
+    array, "check_runs.item" for an array under a key), holding only `fields`:
+    dot paths relative to the element, e.g. "head.sha" or "labels.item.name"
+    (paths through 'item' collect a list). With ijson installed the body is
+    parsed straight off the socket one element at a time, so peak memory is one
+    element rather than the whole page, and callers may stop reading early.
+    """
+    paths = [(f, f.split(".")) for f in fields]
+    if ijson is None:
+        elements = _pluck(r.json(), prefix.split(".")) or []
+    else:
+        raw = r.raw
+        if hasattr(raw, "decode_content"):
+            raw.decode_content = True  # let urllib3 undo gzip
+        elements = ijson.items(raw, prefix, use_float=True)
+    for it in elements:
+        yield {f: _pluck(it, parts) for f, parts in paths}
+
+PR_FIELDS = ("number", "head.sha", "base.ref", "html_url", "labels.item.name")
+CHECK_RUN_FIELDS = ("name", "conclusion", "html_url")
+ISSUE_FIELDS = ("number", "title", "state", "html_url", "labels.item.name")
+
 def get_open_pr(repo: str, base: str = "main", want_label: str | None = None):
-    r = _req("GET", f"{GH}/repos/{repo}/pulls",
+    r = _req("GET", f"{GH}/repos/{repo}/pulls", stream=True,
              params={"state": "open", "base": base, "sort": "updated", "direction": "desc"})
-    for pr in r.json():
-        labels = [l["name"] for l in pr.get("labels", [])]
-        if (want_label is None) or (want_label in labels):
-            return {"number": pr["number"], "head_sha": pr["head"]["sha"],
-                    "base": pr["base"]["ref"], "url": pr["html_url"], "labels": labels}
+    try:
+        # Stop reading as soon as a matching PR has been parsed
+        for pr in _project(r, "item", PR_FIELDS):
+            labels = pr["labels.item.name"] or []
+            if (want_label is None) or (want_label in labels):
+                return {"number": pr["number"], "head_sha": pr["head.sha"],
+                        "base": pr["base.ref"], "url": pr["html_url"], "labels": labels}
+    finally:
+        r.close()
     return None
 
 def get_latest_run_for_sha(repo: str, sha: str):
@@ -41,14 +142,72 @@ def get_latest_run_for_sha(repo: str, sha: str):
     return {"status": wr["status"], "conclusion": wr["conclusion"], "url": wr["html_url"]}
 
 def get_check_runs(repo: str, ref: str):
-    r = _req("GET", f"{GH}/repos/{repo}/commits/{ref}/check-runs")
-    return [{"name": cr["name"], "conclusion": cr["conclusion"], "url": cr["html_url"]}
-            for cr in r.json().get("check_runs", [])]
+    r = _req("GET", f"{GH}/repos/{repo}/commits/{ref}/check-runs", stream=True)
+    try:
+        return [{"name": cr["name"], "conclusion": cr["conclusion"], "url": cr["html_url"]}
+                for cr in _project(r, "check_runs.item", CHECK_RUN_FIELDS)]
+    finally:
+        r.close()
+
+def _server_time(r) -> str:
+    """GitHub's clock from the Date header (avoids local clock skew), as ISO-8601 UTC."""
+    try:
+        dt = parsedate_to_datetime(r.headers["Date"])
+    except (KeyError, TypeError, ValueError):
+        dt = datetime.now(timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _sync_pages(index: IssueIndex, url: str, params: dict):
+    """Stream every page of an /issues listing into the index; returns the first page's server time."""
+    first = None
+    while url:
+        r = _req("GET", url, params=params, stream=True)
+        # Stamp with the time of the first page so nothing updated mid-sync is missed
+        first = first or _server_time(r)
+        try:
+            index.apply(
+                {"number": it["number"], "title": it["title"], "state": it["state"],
+                 "url": it["html_url"], "labels": it["labels.item.name"] or []}
+                for it in _project(r, "item", ISSUE_FIELDS)
+            )
+        finally:
+            r.close()
+        # The next link already carries the query string
+        url, params = r.links.get("next", {}).get("url"), None
+    return first
+
+def sync_issue_index(repo: str, labels=()) -> IssueIndex:
+    """
+    Bring the local issue index up to date for `labels`. Labels the index doesn't
+    cover yet are bootstrapped with a label-filtered open-issues listing (one per
+    label, since GitHub's labels= filter is AND); covered labels are refreshed
+    with everything updated since the last sync (state=all), so open/closed and
+    relabel transitions are applied.
+    """
+    # Under a cassette, start from an empty in-memory index so recordings don't
+    # depend on (or alter) whatever local index state the machine happens to have
+    cassette = get_cassette()
+    index = IssueIndex(repo) if cassette else IssueIndex.load(repo)
+    url = f"{GH}/repos/{repo}/issues"
+    stamps = []
+
+    if index.synced_at and index.labels:
+        stamps.append(_sync_pages(index, url, {"state": "all", "since": index.synced_at, "per_page": 100}))
+    for label in index.uncovered(labels):
+        index.cover(label)
+        stamps.append(_sync_pages(index, url, {"state": "open", "labels": label, "per_page": 100}))
+
+    if not stamps:
+        return index
+    index.synced_at = min(stamps)
+    if cassette is None:
+        index.save()
+    return index
 
 def get_blockers(repo: str, labels_csv: str = "release-blocker,P1"):
-    r = _req("GET", f"{GH}/repos/{repo}/issues", params={"state": "open", "labels": labels_csv})
-    return [{"title": it["title"], "labels": [l["name"] for l in it["labels"]], "url": it["html_url"]}
-            for it in r.json()]
+    """Open issues carrying ANY of the comma-separated labels (OR, unlike GitHub's labels= filter)."""
+    labels = [l for l in (s.strip() for s in labels_csv.split(",")) if l]
+    return sync_issue_index(repo, labels).blockers(labels)
 
 def get_branch_head_sha(repo: str, branch: str = "main"):
     r = _req("GET", f"{GH}/repos/{repo}/branches/{branch}")
@@ -59,3 +218,78 @@ def get_default_branch(repo: str) -> str:
     r = _req("GET", f"{GH}/repos/{repo}")
     return r.json().get("default_branch", "main")
 
+# ---------- failed-job logs ----------
+
+# Actions check runs link to .../actions/runs/<run_id>/job/<job_id>; the check run id is the job id
+_JOB_URL = re.compile(r"/actions/runs/\d+/jobs?/(\d+)")
+_LOG_TIMESTAMP = re.compile(r"^\d{4}-\d\d-\d\dT[\d:.]+Z ")
+_ANNOTATION = re.compile(r"##\[error\]")
+_ERRORISH = re.compile(r"\b(error|failed|failure|fatal|panic|exception|traceback)\b|\bFAIL\b|✕|✖", re.I)
+MAX_LOG_LINE = 4096   # longest partial line we buffer; the rest of a huge line is skipped
+
+def job_id_from_url(url: str | None) -> int | None:
+    m = _JOB_URL.search(url or "")
+    return int(m.group(1)) if m else None
+
+def _scan_job_log(repo: str, job_id: int, max_bytes: int, max_lines: int, chunk_size: int):
+    # Straight to _fetch: the body is never stored (cassettes record our result instead)
+    r = _fetch("GET", f"{GH}/repos/{repo}/actions/jobs/{job_id}/logs", None, stream=True, cache=False)
+    if r.status_code >= 400:
+        r.close()
+        return {"lines": [], "bytes": 0, "truncated": False, "error": f"HTTP {r.status_code}"}
+
+    annotations, others, seen = [], [], set()
+    read, truncated, tail = 0, False, b""
+
+    def scan(raw: bytes):
+        line = _LOG_TIMESTAMP.sub("", raw.decode("utf-8", errors="replace").rstrip("\r"))
+        line = line.strip()[:300]
+        if not line or line in seen:
+            return
+        if _ANNOTATION.search(line):
+            if len(annotations) < max_lines:
+                seen.add(line)
+                annotations.append(line.replace("##[error]", "").strip() or line)
+        elif len(others) < max_lines and _ERRORISH.search(line):
+            seen.add(line)
+            others.append(line)
+
+    # Decoded log size, when the headers give it (a transport encoding hides it)
+    length = r.headers.get("Content-Length")
+    total = int(length) if length and length.isdigit() and not r.headers.get("Content-Encoding") else None
+
+    try:
+        for chunk in r.iter_content(chunk_size=chunk_size):
+            cut = len(chunk) > max_bytes - read
+            chunk = chunk[:max_bytes - read]
+            read += len(chunk)
+            *lines, tail = (tail + chunk).split(b"\n")
+            for raw in lines:
+                scan(raw)
+            # Keep the start of an overlong line; the rest of it is skipped
+            tail = tail[:MAX_LOG_LINE]
+            if cut or read >= max_bytes or len(annotations) >= max_lines:
+                # Out of budget, or already holding the most specific signal.
+                # Without reading further we only know if the log was cut or is longer;
+                # otherwise truncated=None means "unknown".
+                truncated = True if cut else (read < total if total is not None else None)
+                break
+        scan(tail)
+    finally:
+        r.close()
+    return {"lines": (annotations + others)[:max_lines], "bytes": read, "truncated": truncated}
+
+def get_job_log_errors(repo: str, job_id: int, max_bytes: int, max_lines: int = 5, chunk_size: int = 64 * 1024):
+    """
+    Stream one Actions job log and pull out its most telling error lines:
+    '##[error]' annotations first, then other error-looking lines, deduplicated.
+    Reads at most `max_bytes` (after transport decompression), holding one chunk
+    plus one partial line in memory at a time. HTTP errors come back as `error`.
+    Cassettes record the extracted lines, not the (possibly huge) log body.
+    """
+    cassette = get_cassette()
+    scan = lambda: _scan_job_log(repo, job_id, max_bytes, max_lines, chunk_size)
+    if cassette is None:
+        return scan()
+    request = {"repo": repo, "job_id": job_id, "max_bytes": max_bytes, "max_lines": max_lines, "chunk_size": chunk_size}
+    return cassette.exchange("job_log_errors", request, scan, describe=True)
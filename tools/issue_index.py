@@ -0,0 +1,132 @@
+# tools/issue_index.py
+"""
+Local per-repo index of open issues carrying the labels we gate on, kept fresh
+incrementally via `since=`.
+
+Storage is one small JSON file per repo under $GATEKEEPER_CACHE_DIR/issues/
+(else the root set via set_index_root, e.g. next to a fleet queue; default
+.gatekeeper/issues/). The index only covers labels it was bootstrapped for
+(`labels`), so it never holds the repo's whole issue/PR list. Only open issues
+are kept: a sync that sees an issue closed or relabelled drops it, a reopen
+brings it back. Label lookups go through an in-memory inverted index, so
+blocker queries (OR across labels) never hit the network.
+"""
+import json
+import os
+import tempfile
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+__all__ = ["IssueIndex", "index_dir", "set_index_root"]
+
+INDEX_VERSION = 2
+
+
+_ROOT: Optional[str] = None
+
+
+def set_index_root(root: Optional[str]) -> None:
+    """Default cache root for this process; $GATEKEEPER_CACHE_DIR still wins."""
+    global _ROOT
+    _ROOT = root
+
+
+def index_dir() -> str:
+    return os.path.join(os.getenv("GATEKEEPER_CACHE_DIR") or _ROOT or ".gatekeeper", "issues")
+
+
+class IssueIndex:
+    def __init__(self, repo: str, path: Optional[str] = None):
+        self.repo = repo
+        self.path = path or os.path.join(index_dir(), repo.replace("/", "__") + ".json")
+        # ISO-8601 timestamp of the last successful sync (GitHub server clock)
+        self.synced_at: Optional[str] = None
+        # casefolded labels whose open issues have been bootstrapped
+        self.labels: Set[str] = set()
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self._by_label: Dict[str, set] = defaultdict(set)
+
+    # ---------- persistence ----------
+
+    @classmethod
+    def load(cls, repo: str, path: Optional[str] = None) -> "IssueIndex":
+        idx = cls(repo, path)
+        try:
+            with open(idx.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return idx
+        if data.get("version") != INDEX_VERSION or data.get("repo") != repo:
+            return idx
+        idx.synced_at = data.get("synced_at")
+        idx.labels = set(data.get("labels", []))
+        for num, it in data.get("issues", {}).items():
+            idx._put(num, it)
+        return idx
+
+    def save(self) -> None:
+        """Atomic write, so concurrent readers never see a half-written index."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"version": INDEX_VERSION, "repo": self.repo, "synced_at": self.synced_at,
+                "labels": sorted(self.labels), "issues": self.issues}
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    # ---------- updates ----------
+
+    def _put(self, num: str, it: Dict[str, Any]) -> None:
+        self.issues[num] = it
+        for name in it.get("labels", []):
+            self._by_label[name.casefold()].add(num)
+
+    def _drop(self, num: str) -> None:
+        old = self.issues.pop(num, None)
+        if not old:
+            return
+        for name in old.get("labels", []):
+            self._by_label[name.casefold()].discard(num)
+
+    def uncovered(self, labels: Iterable[str]) -> List[str]:
+        """Labels from `labels` that still need a bootstrap sync."""
+        out, seen = [], set(self.labels)
+        for name in (l.strip() for l in labels):
+            if name and name.casefold() not in seen:
+                seen.add(name.casefold())
+                out.append(name)
+        return out
+
+    def cover(self, label: str) -> None:
+        self.labels.add(label.strip().casefold())
+
+    def apply(self, issues: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge {number, title, state, url, labels: [names]} records; returns how many
+        were applied. Only open issues carrying a covered label are kept.
+        """
+        n = 0
+        for it in issues:
+            num = str(it["number"])
+            self._drop(num)
+            names = it.get("labels", [])
+            if it.get("state", "open") == "open" and any(l.casefold() in self.labels for l in names):
+                self._put(num, {"title": it["title"], "labels": list(names), "url": it["url"]})
+            n += 1
+        return n
+
+    # ---------- queries ----------
+
+    def blockers(self, labels: Iterable[str]) -> List[Dict[str, Any]]:
+        """Open issues carrying ANY of `labels` (newest first)."""
+        hits: set = set()
+        for name in labels:
+            hits |= self._by_label.get(name.strip().casefold(), set())
+        return [self.issues[num] for num in sorted(hits, key=int, reverse=True)]
@@ -0,0 +1,193 @@
+# utils/cassette.py
+"""
+Record/replay cassettes for every external exchange (GitHub HTTP + Gemini).
+
+A cassette is a compact JSON file (gzip'd when the path ends with .gz):
+  {"version": 1, "interactions": [{"kind", "key", "request"?, "response", "elapsed"}, ...]}
+
+Replay matches interactions by (kind, key) in FIFO order, so the same request
+issued twice replays its two recorded answers in sequence.
+"""
+import base64
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+
+__all__ = [
+    "Cassette",
+    "CassetteMiss",
+    "RecordedResponse",
+    "get_cassette",
+    "set_cassette",
+]
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when the cassette holds no answer for a request."""
+
+
+class RecordedResponse:
+    """Minimal stand-in for requests.Response built from stored status/headers/body."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes, url: str = ""):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = body
+        self.url = url
+        self.raw = io.BytesIO(body)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    @property
+    def links(self) -> Dict[str, Dict[str, str]]:
+        header = self.headers.get("link")
+        if not header:
+            return {}
+        out = {}
+        for link in parse_header_links(header):
+            key = link.get("rel") or link.get("url")
+            out[key] = link
+        return out
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 65536):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self) -> None:
+        pass
+
+
+def encode_response(r) -> Dict[str, Any]:
+    """Serialize a (real or recorded) HTTP response for storage."""
+    body: bytes = r.content or b""
+    try:
+        stored, b64 = body.decode("utf-8"), False
+    except UnicodeDecodeError:
+        stored, b64 = base64.b64encode(body).decode("ascii"), True
+    out = {"status": r.status_code, "headers": dict(r.headers), "body": stored, "url": r.url}
+    if b64:
+        out["b64"] = True
+    return out
+
+
+def decode_response(data: Dict[str, Any]) -> RecordedResponse:
+    body = data.get("body", "")
+    raw = base64.b64decode(body) if data.get("b64") else body.encode("utf-8")
+    return RecordedResponse(data["status"], data.get("headers", {}), raw, data.get("url", ""))
+
+
+def request_key(request: Any) -> str:
+    """Stable short hash of a JSON-able request description."""
+    canon = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()[:24]
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str, simulate_latency: bool = False):
+        if mode not in {"record", "replay"}:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self._lock = threading.Lock()
+        self._interactions: list = []
+        self._queues: Dict[tuple, deque] = defaultdict(deque)
+        if mode == "replay":
+            self._load()
+
+    # ---------- persistence ----------
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        with self._open("r") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')!r}")
+        for it in data.get("interactions", []):
+            self._queues[(it["kind"], it["key"])].append(it)
+
+    def save(self) -> None:
+        if self.mode != "record":
+            return
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": list(self._interactions)}
+        with self._open("w") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    # ---------- record / replay ----------
+
+    def exchange(
+        self,
+        kind: str,
+        request: Any,
+        fn: Callable[[], Any],
+        *,
+        encode: Callable[[Any], Any] = lambda x: x,
+        decode: Callable[[Any], Any] = lambda x: x,
+        describe: bool = False,
+    ) -> Any:
+        """
+        Replay mode: return the next stored answer for (kind, request).
+        Record mode: call fn(), store encode(result) with its latency, and return
+        decode() of what was stored, so record and replay hand back the same thing.
+        describe=True also stores the request itself (handy for small HTTP requests).
+        """
+        key = request_key(request)
+        if self.mode == "replay":
+            with self._lock:
+                queue = self._queues.get((kind, key))
+                it = queue.popleft() if queue else None
+            if it is None:
+                raise CassetteMiss(f"No recorded {kind} interaction for request: {request!r}")
+            if self.simulate_latency:
+                time.sleep(it.get("elapsed", 0.0))
+            return decode(it["response"])
+
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        stored = encode(result)
+        it = {"kind": kind, "key": key, "response": stored, "elapsed": round(elapsed, 4)}
+        if describe:
+            it["request"] = request
+        with self._lock:
+            self._interactions.append(it)
+        return decode(stored)
+
+
+# ---------- process-wide active cassette ----------
+
+_ACTIVE: Optional[Cassette] = None
+
+
+def set_cassette(cassette: Optional[Cassette]) -> None:
+    global _ACTIVE
+    _ACTIVE = cassette
+
+
+def get_cassette() -> Optional[Cassette]:
+    return _ACTIVE
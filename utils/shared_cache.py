@@ -0,0 +1,132 @@
+# utils/shared_cache.py
+"""
+Cross-process cache shared by fleet workers (one SQLite file, possibly on a shared FS):
+  - HTTP: ETag-validated GitHub responses (a 304 costs no rate-limit quota)
+  - judge: llm_decide results keyed by (model, temperature, signals)
+  - rate limits: last X-RateLimit-* seen per resource, plus request counters
+
+Uses SQLite's default rollback journal (not WAL): WAL needs shared memory and
+does not work across hosts on a network filesystem.
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from utils.cassette import RecordedResponse, decode_response, encode_response
+
+__all__ = ["SharedCache", "get_shared_cache", "set_shared_cache"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http (key TEXT PRIMARY KEY, etag TEXT NOT NULL, response TEXT NOT NULL, stored_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS judge (key TEXT PRIMARY KEY, result TEXT NOT NULL, stored_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS rate_limit (resource TEXT PRIMARY KEY, remaining INTEGER NOT NULL, reset_at REAL NOT NULL, updated_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+class SharedCache:
+    def __init__(self, path: str, min_remaining: int = 50, max_wait: float = 900.0):
+        self.path = path
+        # Pause all workers when this little GitHub quota is left
+        self.min_remaining = min_remaining
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(SCHEMA)
+
+    def _execute(self, sql: str, args: Tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    # ---------- HTTP (ETag) ----------
+
+    def get_http(self, key: str) -> Optional[Tuple[str, RecordedResponse]]:
+        rows = self._execute("SELECT etag, response FROM http WHERE key = ?", (key,))
+        if not rows:
+            return None
+        etag, data = rows[0]
+        return etag, decode_response(json.loads(data))
+
+    def put_http(self, key: str, etag: str, r) -> RecordedResponse:
+        """Store r (reading its body) and return the stored copy."""
+        stored = encode_response(r)
+        data = json.dumps(stored, ensure_ascii=False, separators=(",", ":"))
+        self._execute(
+            "INSERT OR REPLACE INTO http (key, etag, response, stored_at) VALUES (?, ?, ?, ?)",
+            (key, etag, data, time.time()),
+        )
+        return decode_response(stored)
+
+    # ---------- judge ----------
+
+    def get_judge(self, key: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT result FROM judge WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def put_judge(self, key: str, result: Dict[str, Any]) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO judge (key, result, stored_at) VALUES (?, ?, ?)",
+            (key, json.dumps(result, ensure_ascii=False, default=str), time.time()),
+        )
+
+    # ---------- rate limits / counters ----------
+
+    def incr(self, name: str, by: int = 1) -> None:
+        self._execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, by),
+        )
+
+    def counters(self) -> Dict[str, int]:
+        return dict(self._execute("SELECT name, value FROM counters"))
+
+    def note_rate_limit(self, headers) -> None:
+        """Record X-RateLimit-* from a GitHub response (shared by every worker)."""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        self._execute(
+            "INSERT OR REPLACE INTO rate_limit (resource, remaining, reset_at, updated_at) VALUES (?, ?, ?, ?)",
+            (resource, remaining, reset_at, time.time()),
+        )
+
+    def wait_for_quota(self, resource: str = "core") -> float:
+        """
+        Block while the shared quota is below min_remaining; returns seconds slept.
+        Fleet workers keep renewing their job lease meanwhile (gatekeeper.fleet).
+        """
+        rows = self._execute("SELECT remaining, reset_at FROM rate_limit WHERE resource = ?", (resource,))
+        if not rows:
+            return 0.0
+        remaining, reset_at = rows[0]
+        wait = reset_at - time.time()
+        if remaining > self.min_remaining or wait <= 0:
+            return 0.0
+        wait = min(wait + 1.0, self.max_wait)
+        time.sleep(wait)
+        self.incr("rate_limit_wait_sec", int(wait))
+        return wait
+
+    def rate_limits(self) -> Dict[str, Dict[str, float]]:
+        rows = self._execute("SELECT resource, remaining, reset_at FROM rate_limit")
+        return {res: {"remaining": rem, "reset_at": reset} for res, rem, reset in rows}
+
+
+# ---------- process-wide shared cache ----------
+
+_ACTIVE: Optional[SharedCache] = None
+
+
+def set_shared_cache(cache: Optional[SharedCache]) -> None:
+    global _ACTIVE
+    _ACTIVE = cache
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    return _ACTIVE
@@ -0,0 +1,193 @@
+# utils/work_queue.py
+"""
+Durable SQLite job queue for fleet-wide gating.
+
+Workers lease one job at a time. A job whose worker died becomes claimable
+again once its lease expires, so every job runs at least once (possibly more).
+Only the worker still holding the lease may complete or fail a job, and a
+failed job waits out an exponential backoff before it can be claimed again.
+Results land in the same file, which doubles as the common result store.
+Like utils.shared_cache, it sticks to the rollback journal so it can live on a
+shared filesystem.
+"""
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypedDict
+
+__all__ = ["Job", "WorkQueue"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL,
+    base_branch TEXT NOT NULL,
+    blocker_labels TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending | leased | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    not_before REAL,                          -- earliest retry time after a failure
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, lease_until);
+"""
+
+
+class Job(TypedDict):
+    id: int
+    repo: str
+    base_branch: str
+    blocker_labels: str
+    attempts: int
+
+
+class WorkQueue:
+    def __init__(self, path: str, lease_seconds: float = 900.0, max_attempts: int = 3, retry_backoff: float = 30.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Delay before retry n is retry_backoff * 2**(n-1)
+        self.retry_backoff = retry_backoff
+        # isolation_level=None: we issue BEGIN IMMEDIATE ourselves for claims
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Add columns introduced after a queue file was created."""
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "not_before" not in cols:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN not_before REAL")
+
+    def enqueue(self, jobs: Iterable[Tuple[str, str, str]]) -> int:
+        """Add (repo, base_branch, blocker_labels) jobs; returns how many were added."""
+        now = time.time()
+        rows = [(repo, base, labels, now) for repo, base, labels in jobs]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT INTO jobs (repo, base_branch, blocker_labels, enqueued_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Lease the oldest pending (backoff elapsed) or lease-expired job, or None if nothing is claimable."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that already used every attempt are given up on
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), finished_at = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = self._conn.execute(
+                "SELECT id, repo, base_branch, blocker_labels, attempts FROM jobs "
+                "WHERE (status = 'pending' AND (not_before IS NULL OR not_before <= ?)) "
+                "OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                "started_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, row[0]),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return Job(id=row[0], repo=row[1], base_branch=row[2], blocker_labels=row[3], attempts=row[4] + 1)
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """Extend `worker`'s lease by lease_seconds from now; False if it no longer holds it."""
+        cur = self._conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        """Store the result; False if `worker` no longer holds the lease (the job was re-claimed)."""
+        cur = self._conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """
+        Put the job back for another attempt after a backoff, or mark it failed once
+        attempts run out. False if `worker` no longer holds the lease.
+        """
+        now = time.time()
+        cur = self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL, finished_at = ?, not_before = ? + ? * (1 << (attempts - 1)) "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (self.max_attempts, error, now, now, self.retry_backoff, job_id, worker),
+        )
+        return cur.rowcount == 1
+
+    def next_ready(self) -> Optional[float]:
+        """
+        Earliest time a job could become claimable (a backoff ending or a lease
+        expiring), or None once no job is pending or leased.
+        """
+        return self._conn.execute(
+            "SELECT MIN(CASE WHEN status = 'pending' THEN COALESCE(not_before, 0) ELSE lease_until END) "
+            "FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()[0]
+
+    def results(self) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT repo, base_branch, status, attempts, result, error FROM jobs ORDER BY id"
+        ).fetchall()
+        return [
+            {"repo": repo, "base_branch": base, "status": status, "attempts": attempts,
+             "result": json.loads(result) if result else None, "error": error}
+            for repo, base, status, attempts, result, error in rows
+        ]
+
+    def progress(self, window: float = 60.0) -> Dict[str, Any]:
+        """Status counts plus throughput (overall and over the last `window` seconds) and ETA."""
+        now = time.time()
+        counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        first_start, last_finish = self._conn.execute(
+            "SELECT MIN(started_at), MAX(finished_at) FROM jobs WHERE status = 'done'"
+        ).fetchone()
+        recent = self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'done' AND finished_at >= ?", (now - window,)
+        ).fetchone()[0]
+        workers = self._conn.execute(
+            "SELECT COUNT(DISTINCT worker) FROM jobs WHERE status = 'leased' AND lease_until >= ?", (now,)
+        ).fetchone()[0]
+
+        done = counts.get("done", 0)
+        remaining = counts.get("pending", 0) + counts.get("leased", 0)
+        span = (last_finish - first_start) if done and last_finish and first_start else 0.0
+        rate = done / span if span > 0 else 0.0
+        return {
+            "total": sum(counts.values()),
+            "pending": counts.get("pending", 0),
+            "leased": counts.get("leased", 0),
+            "done": done,
+            "failed": counts.get("failed", 0),
+            "active_workers": workers,
+            "jobs_per_min": round(rate * 60, 2),
+            "recent_jobs_per_min": round(recent * 60 / window, 2),
+            "eta_sec": round(remaining / rate, 1) if rate > 0 else None,
+        }